@@ -0,0 +1,219 @@
+"""
+Headless benchmarks for the 2048 game logic.
+
+Reports merge() calls/sec, move() calls/sec and random games/sec for
+several board sizes and engines, with an optional cProfile breakdown
+of random games. Games stop after a maximal number of moves, since
+random play on large boards can last for a very long time. An engine
+that fails on a board size is reported as failed, e.g.
+
+    python benchmark_2048.py --sizes 4x4 6x6 --profile
+"""
+
+import argparse
+import cProfile
+import pstats
+import random
+import sys
+import timeit
+
+from twenty_forty_eight import merge, TwentyFortyEight, BitboardTwentyFortyEight
+from twenty_forty_eight import LargeTwentyFortyEight
+
+BOARD_SIZES = [(4, 4), (5, 5), (6, 6)]
+ENGINES = {"list": TwentyFortyEight,
+           "bitboard": BitboardTwentyFortyEight,
+           "large": LargeTwentyFortyEight}
+# Minimal number of seconds spent on each measurement
+MIN_TIME = 1.0
+SEED = 2048
+# Maximal number of moves of a benchmarked random game
+MAX_GAME_MOVES = 1000
+
+def time_calls(func, min_time):
+    """
+    Call func repeatedly for at least min_time seconds.
+
+    func: function of no argument returning the number of calls it made
+
+    Returns the number of calls per second
+    """
+    calls = 0
+    start = timeit.default_timer()
+    elapsed = 0.0
+    while elapsed < min_time or calls == 0:
+        calls += func()
+        elapsed = timeit.default_timer() - start
+    return calls / elapsed
+
+def bench_merge(line_len, min_time=MIN_TIME):
+    """
+    Return merge() calls per second on random lines of given length.
+    """
+    rng = random.Random(SEED)
+    lines = [[rng.choice([0, 0, 2, 2, 4, 8]) for dummy_idx in range(line_len)]
+             for dummy_line in range(1000)]
+
+    def merge_lines():
+        """
+        Merge every prepared line once.
+        """
+        for line in lines:
+            merge(line)
+        return len(lines)
+
+    return time_calls(merge_lines, min_time)
+
+def bench_move(engine, grid_height, grid_width, min_time=MIN_TIME):
+    """
+    Return move() calls per second of random moves. The game is
+    checked after every move and restarted as soon as it is over,
+    so that every timed move is made on a live board.
+    """
+    random.seed(SEED)
+    game = engine(grid_height, grid_width)
+    directions = [random.choice(range(1, 5)) for dummy_idx in range(1000)]
+
+    def make_moves():
+        """
+        Make every prepared move once.
+        """
+        for direction in directions:
+            game.move(direction)
+            if game.is_game_over():
+                game.reset()
+        return len(directions)
+
+    return time_calls(make_moves, min_time)
+
+def play_random_game(game, max_moves=MAX_GAME_MOVES):
+    """
+    Play random legal moves until the game is over, or for at
+    most max_moves moves.
+
+    Returns the number of moves made
+    """
+    move_num = 0
+    legal_moves = game.legal_moves()
+    while len(legal_moves) > 0 and (max_moves is None or move_num < max_moves):
+        game.move(random.choice(legal_moves))
+        move_num += 1
+        legal_moves = game.legal_moves()
+    return move_num
+
+def bench_games(engine, grid_height, grid_width, min_time=MIN_TIME,
+                max_moves=MAX_GAME_MOVES):
+    """
+    Return random games per second, each game lasting at most
+    max_moves moves.
+    """
+    random.seed(SEED)
+
+    def play_game():
+        """
+        Play one random game from a new board.
+        """
+        play_random_game(engine(grid_height, grid_width), max_moves)
+        return 1
+
+    return time_calls(play_game, min_time)
+
+def run_benchmarks(sizes=BOARD_SIZES, engine_names=None, min_time=MIN_TIME,
+                   max_moves=MAX_GAME_MOVES):
+    """
+    Run every benchmark.
+
+    Returns a list of (benchmark, engine name, size, calls per second),
+    where calls per second is None if the engine failed on that size
+    """
+    if engine_names is None:
+        engine_names = sorted(ENGINES)
+    results = []
+    for line_len in sorted(set(size for grid_size in sizes for size in grid_size)):
+        results.append(("merge", "-", str(line_len), bench_merge(line_len, min_time)))
+    for grid_height, grid_width in sizes:
+        size = str(grid_height) + "x" + str(grid_width)
+        for name in engine_names:
+            engine = ENGINES[name]
+            try:
+                results.append(("move", name, size,
+                                bench_move(engine, grid_height, grid_width, min_time)))
+                results.append(("game", name, size,
+                                bench_games(engine, grid_height, grid_width, min_time,
+                                            max_moves)))
+            except ValueError as error:
+                sys.stderr.write("%s engine failed on %s: %s\n" % (name, size, error))
+                results.append(("-", name, size, None))
+    return results
+
+def format_results(results):
+    """
+    Return the benchmark results as a table.
+    """
+    lines = ["%-8s %-10s %-8s %14s" % ("bench", "engine", "size", "calls/sec")]
+    for bench, name, size, rate in results:
+        if rate is None:
+            lines.append("%-8s %-10s %-8s %14s" % (bench, name, size, "failed"))
+        else:
+            lines.append("%-8s %-10s %-8s %14.1f" % (bench, name, size, rate))
+    return "\n".join(lines)
+
+def profile_games(engine, grid_height, grid_width, num_games=20, limit=20,
+                  max_moves=MAX_GAME_MOVES):
+    """
+    Play random games under cProfile.
+
+    Returns the profile statistics sorted by internal time, as a string
+    """
+    random.seed(SEED)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    for dummy_game in range(num_games):
+        play_random_game(engine(grid_height, grid_width), max_moves)
+    profiler.disable()
+    try:
+        from StringIO import StringIO
+    except ImportError:
+        from io import StringIO
+    stream = StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats("tottime").print_stats(limit)
+    return stream.getvalue()
+
+def parse_size(text):
+    """
+    Parse a board size such as "4x5" into (height, width).
+    """
+    height, width = text.lower().split("x")
+    return (int(height), int(width))
+
+def main(argv=None):
+    """
+    Run the benchmarks from the command line.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--sizes", nargs="+", type=parse_size, default=BOARD_SIZES,
+                        help="board sizes such as 4x4 (default: 4x4 5x5 6x6)")
+    parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES),
+                        help="engines to benchmark (default: all)")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME,
+                        help="seconds spent on each measurement")
+    parser.add_argument("--max-moves", type=int, default=MAX_GAME_MOVES,
+                        help="maximal number of moves of a random game")
+    parser.add_argument("--profile", action="store_true",
+                        help="print a cProfile breakdown of random games")
+    args = parser.parse_args(argv)
+    sys.stdout.write(format_results(run_benchmarks(args.sizes, args.engines,
+                                                   args.min_time, args.max_moves)) + "\n")
+    if args.profile:
+        for name in args.engines or sorted(ENGINES):
+            for grid_height, grid_width in args.sizes:
+                sys.stdout.write("\nProfile of %s engine, %dx%d board\n"
+                                 % (name, grid_height, grid_width))
+                try:
+                    sys.stdout.write(profile_games(ENGINES[name], grid_height, grid_width,
+                                                   max_moves=args.max_moves))
+                except ValueError as error:
+                    sys.stdout.write("failed: %s\n" % error)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1250 @@
+"""
+Cookie Clicker Simulator core, importable without the GUI: the game
+state, the simulator, the strategies and the build information.
+"""
+
+import math
+import heapq
+import bisect
+import collections
+import array
+import struct
+import mmap
+import os
+import sys
+
+# NumPy is loaded on first use: only sweep_clicker and load_history need it
+from optional_numpy import import_numpy
+
+# Constants
+SIM_TIME = 10000000000.0
+#SIM_TIME = 400.0
+BUILD_GROWTH = 1.15
+
+class BuildInfo:
+    """
+    Class to track build information.
+    """
+
+    def __init__(self, build_info = None, growth_factor = BUILD_GROWTH):
+        self._build_growth = growth_factor
+        if build_info == None:
+            self._info = {"Cursor": [15.0, 0.1],
+                          "Grandma": [100.0, 0.5],
+                          "Farm": [500.0, 4.0],
+                          "Factory": [3000.0, 10.0],
+                          "Mine": [10000.0, 40.0],
+                          "Shipment": [40000.0, 100.0],
+                          "Alchemy Lab": [200000.0, 400.0],
+                          "Portal": [1666666.0, 6666.0],
+                          "Time Machine": [123456789.0, 98765.0],
+                          "Antimatter Condenser": [3999999999.0, 999999.0]}
+        else:
+            self._info = {}
+            for key, value in build_info.items():
+                self._info[key] = list(value)
+        self._items = sorted(self._info.keys())
+
+    def build_items(self):
+        """
+        Get a list of buildable items
+        """
+        return list(self._items)
+
+    def get_cost(self, item):
+        """
+        Get the current cost of an item
+        Will throw a KeyError exception if item is not in the build info.
+        """
+        return self._info[item][0]
+
+    def get_cps(self, item):
+        """
+        Get the current CPS of an item
+        Will throw a KeyError exception if item is not in the build info.
+        """
+        return self._info[item][1]
+
+    def update_item(self, item):
+        """
+        Update the cost of an item by the growth factor
+        Will throw a KeyError exception if item is not in the build info.
+        """
+        cost, cps = self._info[item]
+        self._info[item] = [cost * self._build_growth, cps]
+
+    def get_growth_factor(self):
+        """
+        Get the factor costs grow by on every purchase
+        """
+        return self._build_growth
+
+    def clone(self):
+        """
+        Return a clone of this BuildInfo
+        """
+        return BuildInfo(self._info, self._build_growth)
+
+class HistoryView:
+    """
+    Read-only view of a purchase history list: it follows the list
+    as it grows, without ever copying it.
+    """
+
+    def __init__(self, history):
+        self._history = history
+
+    def __len__(self):
+        return len(self._history)
+
+    def __getitem__(self, index):
+        return self._history[index]
+
+    def __iter__(self):
+        return iter(self._history)
+
+    def __str__(self):
+        return str(self._history)
+
+# Layout of one purchase in a history file: time, cost, total cookies
+# and item code, little endian with no padding (28 bytes)
+HISTORY_RECORD = struct.Struct("<dddi")
+# Number of purchases a history file grows by at a time
+HISTORY_CHUNK = 65536
+
+# Length of an item name in serialized histories and checkpoints
+HISTORY_NAME_LENGTH = struct.Struct("<H")
+# Header of a serialized history: layout and number of purchases. The
+# purchases follow the item names, either as four columns (times,
+# costs, totals, item codes) or as HISTORY_RECORD records
+HISTORY_HEADER = struct.Struct("<BI")
+HISTORY_COLUMNS = 0
+HISTORY_RECORDS = 1
+
+def _pack_names(names):
+    """
+    Pack a list of item names.
+    """
+    parts = [struct.pack("<I", len(names))]
+    for name in names:
+        encoded = name.encode("utf-8")
+        parts.append(HISTORY_NAME_LENGTH.pack(len(encoded)))
+        parts.append(encoded)
+    return b"".join(parts)
+
+def _unpack_names(data, offset):
+    """
+    Unpack a list of item names.
+
+    Returns a tuple (names, offset after the names)
+    """
+    name_num = struct.unpack_from("<I", data, offset)[0]
+    offset += 4
+    names = []
+    for dummy_name in range(name_num):
+        length = HISTORY_NAME_LENGTH.unpack_from(data, offset)[0]
+        offset += HISTORY_NAME_LENGTH.size
+        names.append(data[offset:offset + length].decode("utf-8"))
+        offset += length
+    return (names, offset)
+
+def _column_bytes(column):
+    """
+    Return the little endian bytes of a typed array, as a read-only
+    memoryview of the array itself on little endian machines. The
+    view must be released before the array grows again.
+    """
+    if sys.byteorder != "little":
+        column = array.array(column.typecode, column)
+        column.byteswap()
+        return column.tobytes()
+    return memoryview(column).toreadonly()
+
+def _column_from_bytes(typecode, data, offset, length):
+    """
+    Read a typed array of given length from little endian bytes.
+
+    Returns a tuple (array, offset after the array)
+    """
+    column = array.array(typecode)
+    end = offset + length * column.itemsize
+    column.frombytes(data[offset:end])
+    if sys.byteorder != "little":
+        column.byteswap()
+    return (column, end)
+
+class _ItemNames:
+    """
+    Interning of item names to small integer codes, with 0 standing
+    for None, shared by the typed history stores.
+    """
+
+    def __init__(self, on_new_name=None):
+        """
+        on_new_name: optional function called with every name that
+        gets a new code
+        """
+        self._names = [None]
+        self._codes = {None: 0}
+        self._on_new_name = on_new_name
+
+    def __getitem__(self, code):
+        return self._names[code]
+
+    def intern(self, item):
+        """
+        Return the code of an item name, assigning a new one if needed.
+        """
+        code = self._codes.get(item)
+        if code is None:
+            code = len(self._names)
+            self._codes[item] = code
+            self._names.append(item)
+            if self._on_new_name is not None:
+                self._on_new_name(item)
+        return code
+
+    def get_names(self):
+        """
+        Return the list of item names, indexed by item code.
+        """
+        return list(self._names)
+
+class CompactHistory:
+    """
+    Purchase history stored in typed arrays, about 28 bytes per
+    purchase. Item names are interned to small integers, with 0
+    standing for None.
+    """
+
+    def __init__(self):
+        self._names = _ItemNames()
+        self._times = array.array("d")
+        self._costs = array.array("d")
+        self._totals = array.array("d")
+        self._items = array.array("i")
+
+    def __len__(self):
+        return len(self._times)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        return (self._times[index], self._names[self._items[index]],
+                self._costs[index], self._totals[index])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __str__(self):
+        return str(list(self))
+
+    def append(self, entry):
+        """
+        Append a (time, item, cost of item, total cookies) tuple.
+        """
+        self._times.append(entry[0])
+        self._items.append(self._names.intern(entry[1]))
+        self._costs.append(entry[2])
+        self._totals.append(entry[3])
+
+    def get_item_names(self):
+        """
+        Return the list of item names, indexed by item code.
+        """
+        return self._names.get_names()
+
+    def get_columns(self):
+        """
+        Return the times, item codes, costs and total cookies as
+        read-only memoryviews of the underlying arrays, without copying.
+        """
+        return tuple(memoryview(column).toreadonly() for column
+                     in (self._times, self._items, self._costs, self._totals))
+
+    def get_byte_parts(self):
+        """
+        Return the pieces of to_bytes() as a list of bytes and read-only
+        buffers of the columns, so that callers can join them with
+        other data in a single copy. Join them before appending again.
+        """
+        parts = [HISTORY_HEADER.pack(HISTORY_COLUMNS, len(self)),
+                 _pack_names(self._names.get_names()[1:])]
+        parts.extend(_column_bytes(column) for column in
+                     (self._times, self._costs, self._totals, self._items))
+        return parts
+
+    def to_bytes(self):
+        """
+        Return the history as compact little endian bytes, copying
+        its columns as they are.
+        """
+        return b"".join(self.get_byte_parts())
+
+    @staticmethod
+    def from_bytes(data, offset=0):
+        """
+        Read a history written by the to_bytes() method of a
+        CompactHistory or a MappedHistory.
+
+        Returns a tuple (CompactHistory, offset after the history)
+        """
+        layout, length = HISTORY_HEADER.unpack_from(data, offset)
+        names, offset = _unpack_names(data, offset + HISTORY_HEADER.size)
+        history = CompactHistory()
+        for name in names:
+            history._names.intern(name)
+        if layout == HISTORY_COLUMNS:
+            history._times, offset = _column_from_bytes("d", data, offset, length)
+            history._costs, offset = _column_from_bytes("d", data, offset, length)
+            history._totals, offset = _column_from_bytes("d", data, offset, length)
+            history._items, offset = _column_from_bytes("i", data, offset, length)
+        elif layout == HISTORY_RECORDS:
+            for dummy_index in range(length):
+                time, cost, total, code = HISTORY_RECORD.unpack_from(data, offset)
+                history._times.append(time)
+                history._costs.append(cost)
+                history._totals.append(total)
+                history._items.append(code)
+                offset += HISTORY_RECORD.size
+        else:
+            raise ValueError("unknown history layout " + str(layout))
+        return (history, offset)
+
+class MappedHistory:
+    """
+    Purchase history streamed to a memory-mapped file of HISTORY_RECORD
+    records, so memory stays flat however long the game runs. Item
+    names are appended to a text file next to it, one per line. Read
+    the columns back with load_history() once the file is closed.
+    """
+
+    def __init__(self, path, chunk=HISTORY_CHUNK):
+        self._path = path
+        self._chunk = chunk
+        self._length = 0
+        self._names_file = open(path + ".items", "w")
+        self._names = _ItemNames(self._write_name)
+        self._file = open(path, "w+b")
+        self._file.truncate(chunk * HISTORY_RECORD.size)
+        self._map = mmap.mmap(self._file.fileno(), chunk * HISTORY_RECORD.size)
+
+    def _write_name(self, item):
+        """
+        Write a newly interned item name to the names file.
+        """
+        self._names_file.write(str(item) + "\n")
+        self._names_file.flush()
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("history index out of range")
+        time, cost, total, code = HISTORY_RECORD.unpack_from(self._map,
+                                                             index * HISTORY_RECORD.size)
+        return (time, self._names[code], cost, total)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __str__(self):
+        return str(list(self))
+
+    def append(self, entry):
+        """
+        Append a (time, item, cost of item, total cookies) tuple.
+        """
+        if (self._length + 1) * HISTORY_RECORD.size > len(self._map):
+            # grow the file by one chunk and map it again
+            size = len(self._map) + self._chunk * HISTORY_RECORD.size
+            self._map.close()
+            self._file.truncate(size)
+            self._map = mmap.mmap(self._file.fileno(), size)
+        HISTORY_RECORD.pack_into(self._map, self._length * HISTORY_RECORD.size,
+                                 entry[0], entry[2], entry[3], self._names.intern(entry[1]))
+        self._length += 1
+
+    def get_item_names(self):
+        """
+        Return the list of item names, indexed by item code.
+        """
+        return self._names.get_names()
+
+    def get_byte_parts(self):
+        """
+        Return the pieces of to_bytes() as a list of bytes and a
+        read-only buffer of the mapped records, so that callers can
+        join them with other data in a single copy. Join them before
+        appending again.
+        """
+        records = memoryview(self._map)[:self._length * HISTORY_RECORD.size]
+        return [HISTORY_HEADER.pack(HISTORY_RECORDS, self._length),
+                _pack_names(self._names.get_names()[1:]),
+                records.toreadonly()]
+
+    def to_bytes(self):
+        """
+        Return the history as compact bytes, copying the mapped
+        records as they are. Read them with CompactHistory.from_bytes().
+        """
+        return b"".join(self.get_byte_parts())
+
+    def close(self):
+        """
+        Flush the history and cut the file to the recorded purchases.
+        """
+        self._map.flush()
+        self._map.close()
+        self._file.truncate(self._length * HISTORY_RECORD.size)
+        self._file.close()
+        self._names_file.close()
+
+def load_history(path):
+    """
+    Map a closed MappedHistory file without copying it.
+
+    Returns a tuple where the first element is a NumPy record array
+    with fields time, cost, total and item (item codes), and the
+    second element is the list of item names indexed by item code
+    """
+    numpy = import_numpy("load_history")
+    names = [None]
+    with open(path + ".items") as names_file:
+        for line in names_file:
+            names.append(line.rstrip("\n"))
+    dtype = numpy.dtype([("time", "<f8"), ("cost", "<f8"), ("total", "<f8"), ("item", "<i4")])
+    if os.path.getsize(path) == 0:
+        return (numpy.zeros(0, dtype=dtype), names)
+    return (numpy.memmap(path, dtype=dtype, mode="r"), names)
+
+# Serialized ClickerState: time, cookies, total cookies and CPS,
+# followed by the history
+CLICKER_STATE = struct.Struct("<dddd")
+
+class ClickerState:
+    """
+    Simple class to keep track of the game state.
+    """
+
+    def __init__(self, history=None):
+        """
+        history: optional empty history store, such as a CompactHistory
+        or a MappedHistory; defaults to a list
+        """
+        self._total_cookie = 0.0
+        self._current_cookie = 0.0
+        self._current_time = 0.0
+        self._current_cps = 1.0
+        if history is None:
+            history = []
+        self._history = history
+        self._history.append((0.0, None, 0.0, 0.0))
+        self._history_view = HistoryView(self._history)
+        # CompactHistory copy of a history without to_bytes(), kept up
+        # to date by to_bytes()
+        self._history_copy = None
+
+    def __str__(self):
+        """
+        Return human readable state
+        """
+        return "\n"+ "Time: " + str(self._current_time) +"\n"  \
+            "Current Cookies: " + str(self._current_cookie) + "\n"\
+                "CPS: " + str(self._current_cps) + "\n"\
+                    "Total Cookies: " + str(self._total_cookie) + "\n"\
+                        "History (length: " + str(len(self._history)) + "): " + str(self._history) + "\n"
+
+    def get_cookies(self):
+        """
+        Return current number of cookies
+        (not total number of cookies)
+
+        Should return a float
+        """
+        return self._current_cookie
+
+    def get_total_cookies(self):
+        """
+        Return total number of cookies produced so far
+
+        Should return a float
+        """
+        return self._total_cookie
+
+    def get_cps(self):
+        """
+        Get current CPS
+
+        Should return a float
+        """
+        return self._current_cps
+
+    def get_time(self):
+        """
+        Get current time
+
+        Should return a float
+        """
+        return self._current_time
+
+    def get_history(self):
+        """
+        Return history list
+
+        History list should be a list of tuples of the form:
+        (time, item, cost of item, total cookies)
+
+        For example: [(0.0, None, 0.0, 0.0)]
+
+        Should return a copy of any internal data structures,
+        so that they will not be modified outside of the class.
+        """
+        history = list(self._history)
+        return history
+
+    def get_history_view(self):
+        """
+        Return a read-only view of the history list
+
+        The view supports len(), indexing and iteration, and always
+        reflects the current history without copying it.
+        """
+        return self._history_view
+
+    def to_bytes(self, header=b""):
+        """
+        Return the state and its history as compact little endian
+        bytes, after header, in a single copy.
+
+        A CompactHistory or a MappedHistory is copied as it is. Other
+        histories are copied into a CompactHistory kept by the state,
+        which every call only extends with the purchases made since the
+        previous call.
+        """
+        history = self._history
+        if not hasattr(history, "get_byte_parts"):
+            if self._history_copy is None:
+                self._history_copy = CompactHistory()
+            history = self._history_copy
+            for index in range(len(history), len(self._history)):
+                history.append(self._history[index])
+        parts = [header, CLICKER_STATE.pack(self._current_time, self._current_cookie,
+                                            self._total_cookie, self._current_cps)]
+        parts.extend(history.get_byte_parts())
+        return b"".join(parts)
+
+    @staticmethod
+    def from_bytes(data, offset=0, history=None):
+        """
+        Rebuild a state written by to_bytes().
+
+        history: optional empty history store for the restored state
+
+        Returns a tuple (ClickerState, offset after the state)
+        """
+        time, cookies, total, cps = CLICKER_STATE.unpack_from(data, offset)
+        saved, offset = CompactHistory.from_bytes(data, offset + CLICKER_STATE.size)
+        state = ClickerState(history)
+        # ClickerState starts its history with the initial entry
+        for index in range(1, len(saved)):
+            state._history.append(saved[index])
+        state._current_time = time
+        state._current_cookie = cookies
+        state._total_cookie = total
+        state._current_cps = cps
+        return (state, offset)
+
+    def time_until(self, cookies):
+        """
+        Return time until you have the given number of cookies
+        (could be 0.0 if you already have enough cookies)
+
+        Should return a float with no fractional part
+        """
+        if (self._current_cookie >= cookies):
+            return 0.0
+        else:
+            return math.ceil((cookies- self._current_cookie)/self._current_cps)
+
+    def wait(self, time):
+        """
+        Wait for given amount of time and update state
+
+        Should do nothing if time <= 0.0
+        """
+        if time <= 0.0:
+            return
+        else:
+            self._total_cookie += time * self._current_cps
+            self._current_cookie += time * self._current_cps
+            self._current_time += time
+
+    def buy_item(self, item_name, cost, additional_cps):
+        """
+        Buy an item and update state
+
+        Should do nothing if you cannot afford the item
+        """
+        if self._current_cookie >= cost:
+            self._current_cookie -= cost
+            self._current_cps += additional_cps
+            self._history.append((self._current_time, item_name, cost, self._total_cookie))
+
+def simulate_clicker(build_info, duration, strategy, history=None,
+                     checkpoint_every=None, on_checkpoint=None):
+    """
+        Function to run a Cookie Clicker game for the given
+        duration with the given strategy.  Returns a ClickerState
+        object corresponding to the final state of the game.
+
+        history: optional empty history store given to ClickerState
+        checkpoint_every, on_checkpoint: if given, on_checkpoint is
+        called with a save_checkpoint() snapshot after every
+        checkpoint_every purchases
+        """
+    build_info_copy = build_info.clone()
+    cookieclicker = ClickerState(history)
+    return _run_clicker(cookieclicker, build_info_copy, duration, strategy,
+                        checkpoint_every, on_checkpoint)
+
+def _run_clicker(cookieclicker, build_info_copy, duration, strategy,
+                 checkpoint_every, on_checkpoint):
+    """
+    Run a game from the given state until duration, updating
+    build_info_copy. Returns cookieclicker.
+    """
+    if checkpoint_every is not None:
+        if on_checkpoint is None:
+            raise ValueError("checkpoint_every needs an on_checkpoint function")
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be at least 1")
+    # strategies get a view of the history, copying it before every
+    # purchase would make long games quadratic
+    history = cookieclicker.get_history_view()
+    purchase_num = 0
+    # check if current time is out of duration
+    while cookieclicker.get_time() <= duration:
+        timeleft = duration - cookieclicker.get_time()
+        current_cookie = cookieclicker.get_cookies()
+        current_cps = cookieclicker.get_cps()
+        # detetmine to buy which item depending on the strategy
+        item = strategy(current_cookie, current_cps,history,timeleft, build_info_copy)
+        if item == None:
+            break
+        # determine to wait how long
+        time_to_wait = cookieclicker.time_until(build_info_copy.get_cost(item))
+        # if time to wait pass the duration time
+        if time_to_wait > timeleft:
+            break
+        # wait until time to wait
+        cookieclicker.wait(time_to_wait)
+
+        # buy the item
+        cookieclicker.buy_item(item, build_info_copy.get_cost(item), build_info_copy.get_cps(item))
+
+        # update the build information.
+        build_info_copy.update_item(item)
+
+        purchase_num += 1
+        if checkpoint_every is not None and purchase_num % checkpoint_every == 0:
+            on_checkpoint(save_checkpoint(cookieclicker, build_info_copy))
+
+    if duration - cookieclicker.get_time() > 0.0:
+        cookieclicker.wait(duration - cookieclicker.get_time())
+    return cookieclicker
+
+# Checkpoint layout: header (magic, cost growth factor, IndexedBuildInfo
+# flag, number of items), then the catalog (names, costs, CPS) and the
+# ClickerState, all little endian
+CHECKPOINT_MAGIC = b"CCK2"
+CHECKPOINT_HEADER = struct.Struct("<4sdBI")
+
+def save_checkpoint(state, build_info):
+    """
+    Return a compact binary snapshot of a game: the ClickerState
+    with its history, and the (cloned) BuildInfo the game is using.
+    A history-driven strategy resumes at the same position, since
+    it sees the same history. See ClickerState.to_bytes() for the
+    cost of snapshotting the history.
+    """
+    items = list(build_info.build_items())
+    catalog = b"".join([CHECKPOINT_HEADER.pack(CHECKPOINT_MAGIC, build_info.get_growth_factor(),
+                                               isinstance(build_info, IndexedBuildInfo),
+                                               len(items)),
+                        _pack_names(items),
+                        _column_bytes(array.array("d", [build_info.get_cost(item)
+                                                        for item in items])),
+                        _column_bytes(array.array("d", [build_info.get_cps(item)
+                                                        for item in items]))])
+    return state.to_bytes(catalog)
+
+def load_checkpoint(data, history=None):
+    """
+    Rebuild a game from a save_checkpoint() snapshot.
+
+    history: optional empty history store for the restored state
+
+    Returns a tuple (ClickerState, BuildInfo)
+    """
+    magic, growth, indexed, item_num = CHECKPOINT_HEADER.unpack_from(data, 0)
+    if magic != CHECKPOINT_MAGIC:
+        raise ValueError("not a cookie clicker checkpoint")
+    items, offset = _unpack_names(data, CHECKPOINT_HEADER.size)
+    costs, offset = _column_from_bytes("d", data, offset, item_num)
+    item_cps, offset = _column_from_bytes("d", data, offset, item_num)
+    build_info = BuildInfo(dict((item, [costs[index], item_cps[index]])
+                                for index, item in enumerate(items)), growth)
+    if indexed:
+        build_info = IndexedBuildInfo(build_info)
+    state, offset = ClickerState.from_bytes(data, offset, history)
+    return (state, build_info)
+
+def resume_clicker(data, duration, strategy, history=None,
+                   checkpoint_every=None, on_checkpoint=None):
+    """
+    Continue the game saved in a save_checkpoint() snapshot until
+    duration, as simulate_clicker would have. One snapshot can be
+    resumed any number of times, e.g. with other strategies or
+    durations, without simulating its prefix again.
+
+    Returns the final ClickerState
+    """
+    cookieclicker, build_info = load_checkpoint(data, history)
+    return _run_clicker(cookieclicker, build_info, duration, strategy,
+                        checkpoint_every, on_checkpoint)
+
+def strategy_cursor_broken(cookies, cps, history, time_left, build_info):
+    """
+        Always pick Cursor!
+
+        Note that this simplistic (and broken) strategy does not properly
+        check whether it can actually buy a Cursor in the time left.  Your
+        simulate_clicker function must be able to deal with such broken
+        strategies.  Further, your strategy functions must correctly check
+        if you can buy the item in the time left and return None if you
+        can't.
+        """
+    return "Cursor"
+
+def strategy_none(cookies, cps, history, time_left, build_info):
+    """
+        Always return None
+
+        This is a pointless strategy that will never buy anything, but
+        that you can use to help debug your simulate_clicker function.
+        """
+    return None
+
+def strategy_cheap(cookies, cps, history, time_left, build_info):
+    """
+        Always buy the cheapest item you can afford in the time left.
+        """
+    cost = float('inf')
+    item_chosen = None
+    items = build_info.build_items()
+    for item in items:
+        if build_info.get_cost(item) <= cookies + time_left * cps:
+            if build_info.get_cost(item) < cost:
+                item_chosen = item
+                cost = build_info.get_cost(item)
+    return item_chosen
+
+def strategy_expensive(cookies, cps, history, time_left, build_info):
+    """
+    Always buy the most expensive item you can afford in the time left.
+    """
+    cost = float('-inf')
+    item_chosen = None
+    items = build_info.build_items()
+    for item in items:
+        if build_info.get_cost(item) <= cookies + time_left * cps:
+            if build_info.get_cost(item) > cost:
+                item_chosen = item
+                cost = build_info.get_cost(item)
+    return item_chosen
+
+def strategy_best(cookies, cps, history, time_left, build_info):
+    """
+    The best strategy that you are able to implement.
+    Always choose the item with the highest CPS/COST
+    """
+    cost = float('-inf')
+    item_chosen = None
+    items = build_info.build_items()
+    for item in items:
+        if build_info.get_cost(item) <= cookies + time_left * cps:
+            if build_info.get_cps(item) / build_info.get_cost(item) > cost:
+                item_chosen = item
+                cost = build_info.get_cps(item) / build_info.get_cost(item)
+    return item_chosen
+
+class IndexedBuildInfo:
+    """
+    Wrapper around a BuildInfo that keeps its items indexed by cost
+    and by CPS/cost ratio, so the indexed strategies below pick an
+    item in logarithmic time. Items of equal cost or ratio are ordered
+    like build_items(), so ties go to the same item as the original
+    strategies. Only the purchased item is re-indexed when update_item
+    is called: its heap entries are pushed in logarithmic time, but
+    moving it in the sorted cost list is a list deletion and insertion,
+    which is linear (a fast memory move) in the number of items.
+    """
+
+    def __init__(self, build_info):
+        self._build_info = build_info
+        self._items = list(build_info.build_items())
+        self._ranks = dict((item, rank) for rank, item in enumerate(self._items))
+        self._versions = dict((item, 0) for item in self._items)
+        # (cost, rank) of the items sorted by cost, the items in the
+        # same order and their costs, for range queries
+        self._by_cost = sorted((build_info.get_cost(item), self._ranks[item])
+                               for item in self._items)
+        self._cost_items = [self._items[rank] for dummy_cost, rank in self._by_cost]
+        self._costs = [cost for cost, dummy_rank in self._by_cost]
+        self._rebuild_heaps()
+
+    def _rebuild_heaps(self):
+        """
+        Rebuild the heaps from the current costs, dropping the
+        entries of items that were updated since they were pushed.
+        """
+        self._cost_heap = [self._cost_entry(item) for item in self._items]
+        self._ratio_heap = [self._ratio_entry(item) for item in self._items]
+        heapq.heapify(self._cost_heap)
+        heapq.heapify(self._ratio_heap)
+
+    def _cost_entry(self, item):
+        """
+        Heap entry of an item keyed by cost.
+        """
+        return (self._build_info.get_cost(item), self._ranks[item], self._versions[item])
+
+    def _ratio_entry(self, item):
+        """
+        Heap entry of an item keyed by decreasing CPS/cost ratio.
+        """
+        ratio = self._build_info.get_cps(item) / self._build_info.get_cost(item)
+        return (-ratio, self._ranks[item], self._versions[item])
+
+    def _top(self, heap):
+        """
+        Return the first up-to-date entry of a heap, discarding
+        the outdated ones, or None if the heap is empty.
+        """
+        while len(heap) > 0 and heap[0][2] != self._versions[self._items[heap[0][1]]]:
+            heapq.heappop(heap)
+        if len(heap) == 0:
+            return None
+        return heap[0]
+
+    def build_items(self):
+        """
+        Get a list of buildable items
+        """
+        return self._build_info.build_items()
+
+    def get_cost(self, item):
+        """
+        Get the current cost of an item
+        """
+        return self._build_info.get_cost(item)
+
+    def get_cps(self, item):
+        """
+        Get the current CPS of an item
+        """
+        return self._build_info.get_cps(item)
+
+    def update_item(self, item):
+        """
+        Update the cost of an item by the growth factor
+        """
+        rank = self._ranks[item]
+        old_cost = self._build_info.get_cost(item)
+        self._build_info.update_item(item)
+        index = bisect.bisect_left(self._by_cost, (old_cost, rank))
+        del self._by_cost[index]
+        del self._cost_items[index]
+        del self._costs[index]
+        new_cost = self._build_info.get_cost(item)
+        index = bisect.bisect_left(self._by_cost, (new_cost, rank))
+        self._by_cost.insert(index, (new_cost, rank))
+        self._cost_items.insert(index, item)
+        self._costs.insert(index, new_cost)
+        self._versions[item] += 1
+        if len(self._cost_heap) > 2 * len(self._items):
+            self._rebuild_heaps()
+        else:
+            heapq.heappush(self._cost_heap, self._cost_entry(item))
+            heapq.heappush(self._ratio_heap, self._ratio_entry(item))
+
+    def get_growth_factor(self):
+        """
+        Get the factor costs grow by on every purchase
+        """
+        return self._build_info.get_growth_factor()
+
+    def clone(self):
+        """
+        Return a clone of this IndexedBuildInfo
+        """
+        return IndexedBuildInfo(self._build_info.clone())
+
+    def cheapest(self, budget):
+        """
+        Return the cheapest item costing at most budget, or None.
+        """
+        entry = self._top(self._cost_heap)
+        if entry is None or entry[0] > budget:
+            return None
+        return self._items[entry[1]]
+
+    def most_expensive(self, budget):
+        """
+        Return the most expensive item costing at most budget, or None.
+        """
+        index = bisect.bisect_right(self._costs, budget) - 1
+        if index < 0:
+            return None
+        # the first of the items of that cost
+        index = bisect.bisect_left(self._costs, self._costs[index])
+        return self._cost_items[index]
+
+    def best_ratio(self, budget):
+        """
+        Return the item with the highest CPS/cost ratio among the
+        items costing at most budget, or None.
+        """
+        heap = self._ratio_heap
+        skipped = []
+        item_chosen = None
+        # the best ratio is nearly always affordable; otherwise look
+        # further down the heap and push the skipped entries back
+        while self._top(heap) is not None:
+            entry = heapq.heappop(heap)
+            skipped.append(entry)
+            if self._build_info.get_cost(self._items[entry[1]]) <= budget:
+                item_chosen = self._items[entry[1]]
+                break
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        return item_chosen
+
+def strategy_cheap_indexed(cookies, cps, history, time_left, build_info):
+    """
+    Same choice as strategy_cheap, in logarithmic time.
+    build_info must be an IndexedBuildInfo.
+    """
+    return build_info.cheapest(cookies + time_left * cps)
+
+def strategy_expensive_indexed(cookies, cps, history, time_left, build_info):
+    """
+    Same choice as strategy_expensive, in logarithmic time.
+    build_info must be an IndexedBuildInfo.
+    """
+    return build_info.most_expensive(cookies + time_left * cps)
+
+def strategy_best_indexed(cookies, cps, history, time_left, build_info):
+    """
+    Same choice as strategy_best, in logarithmic time.
+    build_info must be an IndexedBuildInfo.
+    """
+    return build_info.best_ratio(cookies + time_left * cps)
+
+SweepResult = collections.namedtuple("SweepResult",
+                                     ["items", "cookies", "total_cookies", "cps", "purchases"])
+SWEEP_STRATEGIES = ["cheap", "expensive", "best"]
+
+def sweep_clicker(build_info, durations, growth_rates, start_cps=(1.0,), strategy="best"):
+    """
+    Run one Cookie Clicker game for every combination of duration,
+    cost growth rate and starting CPS. All games advance in lockstep
+    as rows of NumPy arrays, and make the same purchases as
+    simulate_clicker with strategy_cheap, strategy_expensive or
+    strategy_best.
+
+    build_info: BuildInfo giving the items, their initial costs and CPS
+    strategy: one of SWEEP_STRATEGIES
+
+    Returns a SweepResult whose cookies, total_cookies and cps arrays
+    have shape (len(durations), len(growth_rates), len(start_cps)), and
+    whose purchases array adds a last axis counting each item of items
+    """
+    numpy = import_numpy("sweep_clicker")
+    if strategy not in SWEEP_STRATEGIES:
+        raise ValueError("unknown sweep strategy " + str(strategy))
+    items = list(build_info.build_items())
+    item_cps = numpy.array([build_info.get_cps(item) for item in items], dtype=float)
+    grids = numpy.meshgrid(numpy.asarray(durations, dtype=float),
+                           numpy.asarray(growth_rates, dtype=float),
+                           numpy.asarray(start_cps, dtype=float), indexing="ij")
+    shape = grids[0].shape
+    duration, growth, cps = [grid.ravel() for grid in grids]
+    game_num = len(duration)
+    cookies = numpy.zeros(game_num)
+    total = numpy.zeros(game_num)
+    now = numpy.zeros(game_num)
+    costs = numpy.tile(numpy.array([build_info.get_cost(item) for item in items], dtype=float),
+                       (game_num, 1))
+    purchases = numpy.zeros((game_num, len(items)), dtype=numpy.int64)
+    active = numpy.arange(game_num)
+    while len(active) > 0:
+        time_left = duration[active] - now[active]
+        row_costs = costs[active]
+        affordable = row_costs <= (cookies[active] + time_left * cps[active])[:, numpy.newaxis]
+        # rank the affordable items, first maximum wins like the strategies
+        if strategy == "cheap":
+            keys = -row_costs
+        elif strategy == "expensive":
+            keys = row_costs
+        else:
+            keys = item_cps / row_costs
+        choice = numpy.where(affordable, keys, -numpy.inf).argmax(axis=1)
+        cost = row_costs[numpy.arange(len(active)), choice]
+        active_cookies = cookies[active]
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            wait = numpy.where(active_cookies >= cost, 0.0,
+                               numpy.ceil((cost - active_cookies) / cps[active]))
+        # games whose strategy finds nothing to buy in time are over
+        buying = affordable.any(axis=1) & (wait <= time_left)
+        active = active[buying]
+        choice = choice[buying]
+        cost = cost[buying]
+        wait = wait[buying]
+        gained = wait * cps[active]
+        total[active] += gained
+        cookies[active] += gained
+        now[active] += wait
+        cookies[active] -= cost
+        cps[active] += item_cps[choice]
+        costs[active, choice] *= growth[active]
+        purchases[active, choice] += 1
+    remaining = numpy.maximum(duration - now, 0.0)
+    total += remaining * cps
+    cookies += remaining * cps
+    return SweepResult(items, cookies.reshape(shape), total.reshape(shape),
+                       cps.reshape(shape), purchases.reshape(shape + (len(items),)))
+
+# Number of states kept per purchase count by plan_purchases
+PLAN_BEAM_WIDTH = 64
+
+class _CostTable:
+    """
+    Costs of every item after any number of purchases, computed once
+    with update_item on a clone so they match simulate_clicker exactly.
+    """
+
+    def __init__(self, build_info, items):
+        self._build_info = build_info.clone()
+        self._items = items
+        self._costs = [[self._build_info.get_cost(item)] for item in items]
+
+    def get_cost(self, index, count):
+        """
+        Return the cost of item number index after count purchases.
+        """
+        costs = self._costs[index]
+        while len(costs) <= count:
+            self._build_info.update_item(self._items[index])
+            costs.append(self._build_info.get_cost(self._items[index]))
+        return costs[count]
+
+def _add_plan_state(layer, counts, state):
+    """
+    Add a state to the Pareto front of its count vector, unless
+    another state with the same counts reached them no later with
+    no fewer cookies.
+    """
+    front = layer.setdefault(counts, [])
+    for other in front:
+        if other[0] <= state[0] and other[1] >= state[1]:
+            return
+    front[:] = [other for other in front
+                if not (state[0] <= other[0] and state[1] >= other[1])]
+    front.append(state)
+
+def plan_purchases(build_info, duration, beam_width=PLAN_BEAM_WIDTH):
+    """
+    Search for the purchase order maximizing the total cookies
+    after duration seconds.
+
+    States are grouped by their vector of item counts. For each vector
+    only the states that are not dominated (reached later with fewer
+    cookies) are kept, and at most beam_width states per number of
+    purchases, ranked by the total they reach if nothing more is
+    bought. The states strategy_best goes through are always kept, so
+    the plan is never worse than strategy_best. With beam_width None
+    the search is exact.
+
+    Returns a tuple where the first element is the total cookies and
+    the second element is the list of items to buy, in order
+    """
+    items = sorted(build_info.build_items())
+    item_cps = [build_info.get_cps(item) for item in items]
+    costs = _CostTable(build_info, items)
+
+    def buy(counts, state, index):
+        """
+        Return the count vector and the state after buying item number
+        index as soon as possible, or None if it cannot be bought in time.
+        """
+        time, cookies, total, cps = state[:4]
+        cost = costs.get_cost(index, counts[index])
+        if cookies >= cost:
+            wait = 0.0
+        else:
+            wait = math.ceil((cost - cookies) / cps)
+        if wait > duration - time:
+            return None
+        return (counts[:index] + (counts[index] + 1,) + counts[index + 1:],
+                (time + wait, cookies + wait * cps - cost, total + wait * cps,
+                 cps + item_cps[index], state, items[index]))
+
+    # state: (time, cookies, total cookies, cps, previous state, item bought)
+    counts = tuple(0 for dummy_item in items)
+    start = (0.0, 0.0, 0.0, 1.0, None, None)
+    greedy_path = []
+    greedy_state = (counts, start)
+    for entry in simulate_clicker(build_info, duration, strategy_best).get_history_view()[1:]:
+        greedy_state = buy(greedy_state[0], greedy_state[1], items.index(entry[1]))
+        greedy_path.append(greedy_state)
+    best_state = start
+    best_total = duration * 1.0
+    layer = {counts: [start]}
+    purchase_num = 0
+    while len(layer) > 0:
+        next_layer = {}
+        for counts, front in layer.items():
+            for state in front:
+                for index in range(len(items)):
+                    bought = buy(counts, state, index)
+                    if bought is not None:
+                        _add_plan_state(next_layer, bought[0], bought[1])
+        if purchase_num < len(greedy_path):
+            _add_plan_state(next_layer, greedy_path[purchase_num][0],
+                            greedy_path[purchase_num][1])
+        ranked = []
+        for counts, front in next_layer.items():
+            for state in front:
+                final_total = state[2] + (duration - state[0]) * state[3]
+                ranked.append((final_total, counts, state))
+                if final_total > best_total:
+                    best_total = final_total
+                    best_state = state
+        if beam_width is not None and len(ranked) > beam_width:
+            ranked.sort(key=lambda entry: entry[0], reverse=True)
+            next_layer = {}
+            for dummy_total, counts, state in ranked[:beam_width]:
+                next_layer.setdefault(counts, []).append(state)
+            if purchase_num < len(greedy_path):
+                _add_plan_state(next_layer, greedy_path[purchase_num][0],
+                                greedy_path[purchase_num][1])
+        layer = next_layer
+        purchase_num += 1
+    plan = []
+    state = best_state
+    while state[5] is not None:
+        plan.append(state[5])
+        state = state[4]
+    plan.reverse()
+    return (best_total, plan)
+
+def strategy_plan(plan):
+    """
+    Return a strategy that buys the items of plan, in order.
+    """
+    def strategy(cookies, cps, history, time_left, build_info):
+        """
+        Buy the next item of the plan.
+        """
+        if len(history) - 1 < len(plan):
+            return plan[len(history) - 1]
+        return None
+    return strategy
+
+ClickerResult = collections.namedtuple("ClickerResult",
+                                       ["strategy", "catalog", "total_cookies", "cookies",
+                                        "cps", "purchases", "milestone_times"])
+# Total cookies whose time of arrival tournaments report
+MILESTONES = (1e3, 1e6, 1e9, 1e12, 1e15)
+
+def milestone_times(state, build_info, milestones=MILESTONES):
+    """
+    Compute when the total number of cookies of a finished game
+    first reached each milestone, from its history.
+
+    build_info: the BuildInfo the game started with, giving the CPS
+    of each item
+
+    Returns a tuple with one time (or None if never reached) per
+    milestone
+    """
+    history = state.get_history_view()
+    times = [None for dummy_milestone in milestones]
+    cps = 1.0
+    for index in range(len(history)):
+        time, item, dummy_cost, total = history[index]
+        if item is not None:
+            cps += build_info.get_cps(item)
+        if index + 1 < len(history):
+            end_total = history[index + 1][3]
+        else:
+            end_total = state.get_total_cookies()
+        for milestone_index, milestone in enumerate(milestones):
+            if times[milestone_index] is None and total <= milestone <= end_total:
+                times[milestone_index] = time + math.ceil(max(milestone - total, 0.0) / cps)
+    return tuple(times)
+
+def _run_clicker_task(task):
+    """
+    Run the game described by a task tuple in a worker process.
+    """
+    strategy_name, strategy, catalog_name, build_info, duration, milestones = task
+    state = simulate_clicker(build_info, duration, strategy)
+    purchases = {}
+    for entry in state.get_history_view():
+        if entry[1] is not None:
+            purchases[entry[1]] = purchases.get(entry[1], 0) + 1
+    return ClickerResult(strategy_name, catalog_name, state.get_total_cookies(),
+                         state.get_cookies(), state.get_cps(), purchases,
+                         milestone_times(state, build_info, milestones))
+
+def iter_clicker_tournament(strategies, catalogs, duration=SIM_TIME,
+                            milestones=MILESTONES, processes=None):
+    """
+    Run every strategy against every BuildInfo catalog over a
+    process pool.
+
+    strategies: dictionary mapping names to strategy functions, which
+        must be defined at module level so they can be sent to workers
+    catalogs: dictionary mapping names to BuildInfo objects
+    processes: number of worker processes (default: one per CPU);
+        0 runs every game in the calling process
+
+    Yields a ClickerResult for every game, in order of completion
+    """
+    tasks = ((strategy_name, strategies[strategy_name], catalog_name,
+              catalogs[catalog_name], duration, milestones)
+             for strategy_name in sorted(strategies)
+             for catalog_name in sorted(catalogs))
+    # imported here, multiprocessing is the slowest import of the simulator
+    from process_pool import imap_tasks
+    return imap_tasks(_run_clicker_task, tasks, processes)
+
+def run_clicker_tournament(strategies, catalogs, duration=SIM_TIME,
+                           milestones=MILESTONES, processes=None):
+    """
+    Run every strategy against every catalog.
+
+    Returns the list of ClickerResult sorted by strategy and catalog
+    """
+    return sorted(iter_clicker_tournament(strategies, catalogs, duration,
+                                          milestones, processes))
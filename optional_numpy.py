@@ -0,0 +1,18 @@
+"""
+Import of NumPy for the headless modules, which only need it for some
+features and load it on first use, so that importing them stays fast.
+"""
+
+def import_numpy(feature):
+    """
+    Import NumPy on first use.
+
+    feature: what needs NumPy, for the error message
+
+    Returns the numpy module
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("NumPy is required for " + feature)
+    return numpy
@@ -0,0 +1,46 @@
+"""
+Process pools shared by the tournaments and batch tools of the
+headless modules, which import it on first use.
+"""
+
+import contextlib
+import multiprocessing
+
+@contextlib.contextmanager
+def worker_pool(processes=None, initializer=None, initargs=()):
+    """
+    Context manager giving a multiprocessing pool. The pool is closed
+    when the block ends normally, terminated when it ends with an
+    exception (including a generator using it being closed early),
+    and joined in both cases.
+
+    processes: number of worker processes (default: one per CPU)
+    """
+    pool = multiprocessing.Pool(processes, initializer, initargs)
+    finished = False
+    try:
+        yield pool
+        finished = True
+    finally:
+        if finished:
+            pool.close()
+        else:
+            pool.terminate()
+        pool.join()
+
+def imap_tasks(function, tasks, processes=None, chunksize=1):
+    """
+    Apply a module level function to every task over a process pool.
+
+    processes: number of worker processes (default: one per CPU);
+        0 runs every task in the calling process
+
+    Yields the results in order of completion
+    """
+    if processes == 0:
+        for task in tasks:
+            yield function(task)
+        return
+    with worker_pool(processes) as pool:
+        for result in pool.imap_unordered(function, tasks, chunksize):
+            yield result
@@ -0,0 +1,229 @@
+"""
+Compact binary records of 2048 games.
+
+A record stores the game size, the starting seed and the initial
+tiles, followed by one small code per move that changed the grid:
+
+    code = (square * 2 + is_four) * 4 + (direction - 1)
+
+where square = row * grid_width + col is the position of the tile the
+move spawned. Numbers are written as unsigned LEB128 varints, so every
+move of a 4x4 game takes a single byte. Moves that do not change the
+grid are not recorded.
+"""
+
+import random
+
+from twenty_forty_eight import TwentyFortyEight, BitboardMover, decode_tile
+
+RECORD_MAGIC = bytearray(b"2048")
+RECORD_VERSION = 1
+SPAWN_FOUR = 4
+
+def _write_varint(buffer, value):
+    """
+    Append a non-negative integer to a bytearray as a varint.
+    """
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+def _read_varint(data, index):
+    """
+    Read a varint from a bytearray.
+
+    Returns a tuple (value, index of the next byte)
+    """
+    value = 0
+    bit_shift = 0
+    while True:
+        if index >= len(data):
+            raise ValueError("truncated game record")
+        byte = data[index]
+        index += 1
+        value |= (byte & 0x7F) << bit_shift
+        if byte < 0x80:
+            return (value, index)
+        bit_shift += 7
+
+def _zigzag(value):
+    """
+    Map a signed integer to a non-negative one.
+    """
+    if value < 0:
+        return -2 * value - 1
+    return 2 * value
+
+def _unzigzag(value):
+    """
+    Undo _zigzag().
+    """
+    if value & 1:
+        return -(value + 1) // 2
+    return value // 2
+
+def _tile_code(square, value):
+    """
+    Return the code of a spawned tile.
+    """
+    return square * 2 + (1 if value == SPAWN_FOUR else 0)
+
+class GameRecordWriter:
+    """
+    Class to stream the record of a TwentyFortyEight game to a
+    binary file object while the game is played.
+    """
+
+    def __init__(self, fileobj, game, seed=0):
+        """
+        Write the header and the initial tiles of the game, which
+        must have just been reset.
+        """
+        self._fileobj = fileobj
+        self._game = game
+        self._width = game.get_grid_width()
+        self._move_num = 0
+        buffer = bytearray(RECORD_MAGIC)
+        _write_varint(buffer, RECORD_VERSION)
+        _write_varint(buffer, game.get_grid_height())
+        _write_varint(buffer, self._width)
+        _write_varint(buffer, _zigzag(seed))
+        tiles = [(row * self._width + col, game.get_tile(row, col))
+                 for row in range(game.get_grid_height())
+                 for col in range(self._width)
+                 if game.get_tile(row, col) != 0]
+        _write_varint(buffer, len(tiles))
+        for square, value in tiles:
+            _write_varint(buffer, _tile_code(square, value))
+        fileobj.write(bytes(buffer))
+
+    def get_move_num(self):
+        """
+        Return the number of moves recorded so far.
+        """
+        return self._move_num
+
+    def move(self, direction):
+        """
+        Move the game in the given direction and record the move
+        if it changed the grid.
+        """
+        self._game.move(direction)
+        spawn = self._game.get_last_spawn()
+        if spawn is None:
+            return
+        row, col, value = spawn
+        buffer = bytearray()
+        _write_varint(buffer, _tile_code(row * self._width + col, value) * 4 + direction - 1)
+        self._fileobj.write(bytes(buffer))
+        self._move_num += 1
+
+class GameRecord:
+    """
+    Class to read a game record and replay it.
+    """
+
+    def __init__(self, data):
+        """
+        data: the bytes of a record, or a binary file object
+        """
+        if hasattr(data, "read"):
+            data = data.read()
+        self._data = bytearray(data)
+        if self._data[:len(RECORD_MAGIC)] != RECORD_MAGIC:
+            raise ValueError("not a 2048 game record")
+        index = len(RECORD_MAGIC)
+        version, index = _read_varint(self._data, index)
+        if version != RECORD_VERSION:
+            raise ValueError("unsupported game record version " + str(version))
+        self._height, index = _read_varint(self._data, index)
+        self._width, index = _read_varint(self._data, index)
+        seed, index = _read_varint(self._data, index)
+        self._seed = _unzigzag(seed)
+        tile_num, index = _read_varint(self._data, index)
+        self._initial_tiles = []
+        for dummy_tile in range(tile_num):
+            code, index = _read_varint(self._data, index)
+            self._initial_tiles.append(self._decode_spawn(code))
+        self._moves_start = index
+        self._mover = BitboardMover(self._height, self._width)
+
+    def get_grid_height(self):
+        """
+        Get the height of the board.
+        """
+        return self._height
+
+    def get_grid_width(self):
+        """
+        Get the width of the board.
+        """
+        return self._width
+
+    def get_seed(self):
+        """
+        Get the starting seed of the game.
+        """
+        return self._seed
+
+    def _decode_spawn(self, code):
+        """
+        Return (row, col, value) of a spawned tile code.
+        """
+        square = code // 2
+        value = SPAWN_FOUR if code & 1 else 2
+        return (square // self._width, square % self._width, value)
+
+    def moves(self):
+        """
+        Generator that yields every recorded move as a tuple
+        (direction, (row, col, value) of the spawned tile).
+        """
+        index = self._moves_start
+        while index < len(self._data):
+            code, index = _read_varint(self._data, index)
+            yield (code % 4 + 1, self._decode_spawn(code // 4))
+
+    def get_move_num(self):
+        """
+        Return the number of recorded moves.
+        """
+        return sum(1 for dummy_move in self.moves())
+
+    def replay_board(self, move_num=None):
+        """
+        Return the packed board (see BitboardMover) after the first
+        move_num moves, or after every move if move_num is None. Its
+        tile codes are sized for the board, so every tile the recorded
+        game can reach fits.
+        """
+        mover = self._mover
+        board = 0
+        for row, col, value in self._initial_tiles:
+            board |= mover.encode(value) << mover.get_shift(row, col)
+        if move_num == 0:
+            return board
+        for index, (direction, spawn) in enumerate(self.moves()):
+            row, col, value = spawn
+            board = mover.slide(board, direction) | (mover.encode(value) << mover.get_shift(row, col))
+            if move_num is not None and index + 1 == move_num:
+                break
+        return board
+
+    def replay(self, move_num=None):
+        """
+        Return a TwentyFortyEight game in the state reached after
+        the first move_num moves, or after every move if move_num
+        is None.
+        """
+        board = self.replay_board(move_num)
+        # creating a game spawns random tiles, keep the caller's random
+        # sequence untouched
+        state = random.getstate()
+        game = TwentyFortyEight(self._height, self._width)
+        random.setstate(state)
+        for row in range(self._height):
+            for col in range(self._width):
+                game.set_tile(row, col, decode_tile(self._mover.get_code(board, row, col)))
+        return game
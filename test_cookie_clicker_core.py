@@ -0,0 +1,211 @@
+"""
+Tests of the headless cookie clicker simulator of cookie_clicker_core.py.
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from cookie_clicker_core import BuildInfo, IndexedBuildInfo, simulate_clicker
+from cookie_clicker_core import CompactHistory, MappedHistory, load_history
+from cookie_clicker_core import ClickerState, load_checkpoint, resume_clicker
+from cookie_clicker_core import save_checkpoint, sweep_clicker
+from cookie_clicker_core import strategy_cheap, strategy_expensive, strategy_best
+from cookie_clicker_core import strategy_cheap_indexed, strategy_expensive_indexed
+from cookie_clicker_core import strategy_best_indexed
+
+STRATEGY_PAIRS = [(strategy_cheap, strategy_cheap_indexed),
+                  (strategy_expensive, strategy_expensive_indexed),
+                  (strategy_best, strategy_best_indexed)]
+
+def random_catalog(rng, item_num):
+    """
+    Return a catalog whose costs and CPS take few distinct values,
+    so that many items tie.
+    """
+    return dict(("item%03d" % index, [float(rng.choice([10, 20, 40])),
+                                      float(rng.choice([1, 2, 4]))])
+                for index in range(item_num))
+
+class IndexedStrategyTest(unittest.TestCase):
+    """
+    The indexed strategies make the same choices as the original ones.
+    """
+
+    def test_ties_choose_the_first_item(self):
+        catalog = {"A": [10.0, 1.0], "B": [10.0, 2.0], "C": [10.0, 1.0]}
+        for strategy, indexed_strategy in STRATEGY_PAIRS:
+            build_info = BuildInfo(catalog)
+            indexed_info = IndexedBuildInfo(BuildInfo(catalog))
+            self.assertEqual(indexed_strategy(0.0, 1.0, [], 100.0, indexed_info),
+                             strategy(0.0, 1.0, [], 100.0, build_info))
+        self.assertEqual(strategy_expensive_indexed(0.0, 1.0, [], 100.0,
+                                                    IndexedBuildInfo(BuildInfo(catalog))), "A")
+
+    def test_histories_match_with_ties(self):
+        rng = random.Random(11)
+        for dummy_catalog in range(10):
+            catalog = random_catalog(rng, 30)
+            for strategy, indexed_strategy in STRATEGY_PAIRS:
+                state = simulate_clicker(BuildInfo(catalog, 1.1), 20000.0, strategy)
+                indexed_state = simulate_clicker(IndexedBuildInfo(BuildInfo(catalog, 1.1)),
+                                                 20000.0, indexed_strategy)
+                self.assertEqual(list(indexed_state.get_history()), list(state.get_history()))
+
+def simulate_from_cps(build_info, duration, strategy, start_cps):
+    """
+    Run simulate_clicker from a starting CPS other than 1, by giving
+    the missing CPS away at time 0 before resuming the game.
+    """
+    state = ClickerState()
+    if start_cps != 1.0:
+        state.buy_item("start", 0.0, start_cps - 1.0)
+    return resume_clicker(save_checkpoint(state, build_info.clone()), duration, strategy)
+
+class SweepTest(unittest.TestCase):
+    """
+    Sweeps end like the games simulate_clicker runs one at a time.
+    """
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_sweep_matches_simulate_clicker(self):
+        durations = [1e3, 1e5, 1e7]
+        growth_rates = [1.05, 1.15]
+        start_cps = [1.0, 2.5]
+        catalogs = [None, {"a": [10.0, 1.0], "b": [10.0, 1.0], "c": [25.0, 3.0]}]
+        strategies = {"cheap": strategy_cheap, "expensive": strategy_expensive,
+                      "best": strategy_best}
+        for catalog in catalogs:
+            for name in sorted(strategies):
+                result = sweep_clicker(BuildInfo(catalog), durations, growth_rates,
+                                       start_cps, name)
+                for index_duration, duration in enumerate(durations):
+                    for index_growth, growth_rate in enumerate(growth_rates):
+                        for index_cps, cps in enumerate(start_cps):
+                            index = (index_duration, index_growth, index_cps)
+                            state = simulate_from_cps(BuildInfo(catalog, growth_rate), duration,
+                                                      strategies[name], cps)
+                            self.assertEqual(result.cookies[index], state.get_cookies())
+                            self.assertEqual(result.total_cookies[index],
+                                             state.get_total_cookies())
+                            self.assertEqual(result.cps[index], state.get_cps())
+                            items = [entry[1] for entry in state.get_history()]
+                            self.assertEqual(list(result.purchases[index]),
+                                             [items.count(item) for item in result.items])
+
+class HistoryTest(unittest.TestCase):
+    """
+    The typed history stores record the same purchases as a list.
+    """
+
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._path = os.path.join(self._directory, "history")
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def test_stores_match_list_history(self):
+        expected = simulate_clicker(BuildInfo(), 1e8, strategy_best).get_history()
+        compact_history = CompactHistory()
+        compact = simulate_clicker(BuildInfo(), 1e8, strategy_best, compact_history)
+        self.assertEqual(compact.get_history(), expected)
+        times, codes, costs, totals = compact_history.get_columns()
+        names = compact_history.get_item_names()
+        self.assertEqual([(times[index], names[codes[index]], costs[index], totals[index])
+                          for index in range(len(times))], expected)
+        # a small chunk makes the file grow several times
+        mapped_history = MappedHistory(self._path, chunk=16)
+        mapped = simulate_clicker(BuildInfo(), 1e8, strategy_best, mapped_history)
+        self.assertEqual(mapped.get_history(), expected)
+        self.assertEqual(mapped_history[-1], expected[-1])
+        self.assertEqual(mapped_history.get_item_names(), names)
+        mapped_history.close()
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_load_history(self):
+        expected = simulate_clicker(BuildInfo(), 1e8, strategy_best).get_history()
+        mapped_history = MappedHistory(self._path, chunk=16)
+        simulate_clicker(BuildInfo(), 1e8, strategy_best, mapped_history)
+        mapped_history.close()
+        records, names = load_history(self._path)
+        self.assertEqual([(record["time"], names[record["item"]], record["cost"],
+                           record["total"]) for record in records], expected)
+        del records
+
+class CheckpointTest(unittest.TestCase):
+    """
+    Games resumed from checkpoints end like uninterrupted games.
+    """
+
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def _mapped_history(self, name):
+        """
+        Return a MappedHistory in the test directory.
+        """
+        return MappedHistory(os.path.join(self._directory, name), chunk=16)
+
+    def test_resume_matches_uninterrupted_game(self):
+        catalog = {"a": [1.0, 1.0], "b": [3.0, 2.5]}
+        cases = [(BuildInfo(), strategy_best, 1e10),
+                 (IndexedBuildInfo(BuildInfo()), strategy_cheap_indexed, 1e10),
+                 (BuildInfo(catalog, 1.001), strategy_cheap, 1e4)]
+        for build_info, strategy, duration in cases:
+            expected = simulate_clicker(build_info, duration, strategy)
+            for source in ("list", "compact", "mapped"):
+                history = {"list": None, "compact": CompactHistory(),
+                           "mapped": self._mapped_history(source)}[source]
+                snapshots = []
+                state = simulate_clicker(build_info, duration, strategy, history,
+                                         checkpoint_every=7, on_checkpoint=snapshots.append)
+                self.assertEqual(state.get_history(), expected.get_history())
+                self.assertTrue(len(snapshots) > 0)
+                for snapshot in (snapshots[0], snapshots[len(snapshots) // 2], snapshots[-1]):
+                    for target in (None, CompactHistory(), self._mapped_history("target")):
+                        resumed = resume_clicker(snapshot, duration, strategy, target)
+                        self.assertEqual(resumed.get_history(), expected.get_history())
+                        self.assertEqual(resumed.get_total_cookies(),
+                                         expected.get_total_cookies())
+                        self.assertEqual(resumed.get_cookies(), expected.get_cookies())
+                        self.assertEqual(resumed.get_cps(), expected.get_cps())
+                        if target is not None and hasattr(target, "close"):
+                            target.close()
+                if history is not None and hasattr(history, "close"):
+                    history.close()
+
+    def test_state_bytes_follow_the_history(self):
+        state = ClickerState()
+        state.wait(100.0)
+        state.buy_item("Cursor", 15.0, 0.1)
+        first = state.to_bytes()
+        state.buy_item("Cursor", 15.0, 0.1)
+        second = state.to_bytes()
+        self.assertEqual(len(ClickerState.from_bytes(first)[0].get_history()), 2)
+        restored, offset = ClickerState.from_bytes(second)
+        self.assertEqual(offset, len(second))
+        self.assertEqual(restored.get_history(), state.get_history())
+        self.assertEqual(restored.get_cookies(), state.get_cookies())
+
+    def test_load_checkpoint_rejects_other_data(self):
+        self.assertRaises(ValueError, load_checkpoint, b"XXXX" + b"\0" * 64)
+
+    def test_checkpoint_arguments_are_checked(self):
+        self.assertRaises(ValueError, simulate_clicker, BuildInfo(), 1e10, strategy_best,
+                          None, 5)
+        self.assertRaises(ValueError, simulate_clicker, BuildInfo(), 1e10, strategy_best,
+                          None, 0, lambda snapshot: None)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Tests of the 2048 game records of record_2048.py.
+"""
+
+import io
+import random
+import unittest
+
+from twenty_forty_eight import TwentyFortyEight, LEFT
+from record_2048 import GameRecordWriter, GameRecord
+
+class CornerSpawnGame(TwentyFortyEight):
+    """
+    Game spawning every new tile as a 2 in the last empty square,
+    which lets a single row grow tiles beyond 32768 quickly.
+    """
+
+    def new_tile(self):
+        empty_squares = self.get_empty_squares()
+        if len(empty_squares) == 0:
+            return
+        row, col = max(empty_squares)
+        self.set_tile(row, col, 2)
+        self._last_spawn = (row, col, 2)
+
+def get_grid(game):
+    """
+    Return the tiles of a game as a list of rows.
+    """
+    return [[game.get_tile(row, col) for col in range(game.get_grid_width())]
+            for row in range(game.get_grid_height())]
+
+class RecordTest(unittest.TestCase):
+    """
+    Round trips of games through records.
+    """
+
+    def test_random_game_round_trip(self):
+        random.seed(8)
+        game = TwentyFortyEight(4, 4)
+        record_file = io.BytesIO()
+        writer = GameRecordWriter(record_file, game, 8)
+        grids = [get_grid(game)]
+        while len(game.legal_moves()) > 0:
+            writer.move(random.choice(game.legal_moves()))
+            grids.append(get_grid(game))
+        record = GameRecord(record_file.getvalue())
+        self.assertEqual(record.get_seed(), 8)
+        self.assertEqual(record.get_move_num(), writer.get_move_num())
+        for move_num in (0, 1, len(grids) // 2, len(grids) - 1):
+            self.assertEqual(get_grid(record.replay(move_num)), grids[move_num])
+        self.assertEqual(get_grid(record.replay()), grids[-1])
+
+    def test_large_board_beyond_32768_round_trip(self):
+        game = CornerSpawnGame(1, 18)
+        record_file = io.BytesIO()
+        writer = GameRecordWriter(record_file, game)
+        while max(get_grid(game)[0]) < 65536:
+            writer.move(LEFT)
+        record = GameRecord(record_file.getvalue())
+        self.assertEqual(record.get_move_num(), writer.get_move_num())
+        self.assertEqual(get_grid(record.replay()), get_grid(game))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+"""
+Tests comparing the 2048 engines of twenty_forty_eight.py.
+"""
+
+import random
+import unittest
+
+import twenty_forty_eight
+from twenty_forty_eight import TwentyFortyEight, BitboardTwentyFortyEight, BitboardMover
+from twenty_forty_eight import BitboardOverflowError, ExpectimaxPlayer
+from twenty_forty_eight import UP, DOWN, LEFT, RIGHT, BITBOARD_TILE_BITS, decode_tile
+
+BOARD_SIZES = [(1, 1), (2, 3), (3, 3), (4, 4), (3, 5), (5, 4), (6, 6), (8, 8), (2, 9)]
+TILES = [0, 0, 0, 2, 2, 4, 8, 16, 1024, 32768]
+
+def random_grid(rng, grid_height, grid_width):
+    """
+    Return a random grid of tile values the board can reach.
+    """
+    tiles = [value for value in TILES if value <= 1 << (grid_height * grid_width)]
+    return [[rng.choice(tiles) for dummy_col in range(grid_width)]
+            for dummy_row in range(grid_height)]
+
+def list_slide(grid, direction):
+    """
+    Return the grid after moving the list engine in the given
+    direction, without the tile it spawns.
+    """
+    game = TwentyFortyEight(len(grid), len(grid[0]))
+    for row in range(len(grid)):
+        for col in range(len(grid[0])):
+            game.set_tile(row, col, grid[row][col])
+    state = random.getstate()
+    game.move(direction)
+    random.setstate(state)
+    spawn = game.get_last_spawn()
+    if spawn is not None:
+        game.set_tile(spawn[0], spawn[1], 0)
+    return [[game.get_tile(row, col) for col in range(len(grid[0]))]
+            for row in range(len(grid))]
+
+def bitboard_game(grid):
+    """
+    Return a bitboard game holding the given grid.
+    """
+    state = random.getstate()
+    game = BitboardTwentyFortyEight(len(grid), len(grid[0]))
+    random.setstate(state)
+    for row in range(len(grid)):
+        for col in range(len(grid[0])):
+            game.set_tile(row, col, grid[row][col])
+    return game
+
+class BitboardTest(unittest.TestCase):
+    """
+    Tests of the bitboard engine against the list engine.
+    """
+
+    def test_slide_matches_list_engine(self):
+        rng = random.Random(1)
+        for grid_height, grid_width in BOARD_SIZES:
+            for mover in (BitboardMover(grid_height, grid_width),
+                          BitboardMover(grid_height, grid_width, BITBOARD_TILE_BITS)):
+                for dummy_board in range(100):
+                    grid = random_grid(rng, grid_height, grid_width)
+                    board = mover.pack(bitboard_game(grid))
+                    expected_slides = {}
+                    for direction in (UP, DOWN, LEFT, RIGHT):
+                        expected = list_slide(grid, direction)
+                        expected_slides[direction] = expected
+                        if max(max(row) for row in expected) >= 1 << (1 << mover.get_tile_bits()):
+                            # beyond 32768 with 4-bit codes
+                            self.assertRaises(BitboardOverflowError, mover.slide, board, direction)
+                            continue
+                        codes = mover.unpack(mover.slide(board, direction))
+                        self.assertEqual([[decode_tile(code) for code in row] for row in codes],
+                                         expected)
+                    if mover.get_tile_bits() > BITBOARD_TILE_BITS:
+                        slides = mover.slide_all(board)
+                        for direction in (UP, DOWN, LEFT, RIGHT):
+                            self.assertEqual(slides[direction], mover.slide(board, direction))
+
+    def test_legal_moves_match_list_engine(self):
+        rng = random.Random(2)
+        for grid_height, grid_width in BOARD_SIZES:
+            for dummy_board in range(50):
+                grid = random_grid(rng, grid_height, grid_width)
+                game = TwentyFortyEight(grid_height, grid_width)
+                for row in range(grid_height):
+                    for col in range(grid_width):
+                        game.set_tile(row, col, grid[row][col])
+                self.assertEqual(bitboard_game(grid).legal_moves(), game.legal_moves())
+
+    def test_tiles_beyond_32768(self):
+        for grid_height, grid_width in [(4, 4), (6, 6), (8, 8)]:
+            grid = [[0] * grid_width for dummy_row in range(grid_height)]
+            grid[0][0] = grid[0][1] = 32768
+            grid[1][0] = grid[1][1] = 1 << (grid_height * grid_width)
+            game = bitboard_game(grid)
+            self.assertEqual(game.legal_moves(), [DOWN, LEFT, RIGHT])
+            game.move(LEFT)
+            self.assertEqual(game.get_tile(0, 0), 65536)
+            self.assertEqual(game.get_tile(1, 0), 1 << (grid_height * grid_width + 1))
+
+    def test_board_widens_past_32768(self):
+        for grid_height, grid_width in [(4, 4), (5, 5), (2, 9)]:
+            grid = [[0] * grid_width for dummy_row in range(grid_height)]
+            grid[0][0] = grid[0][1] = 32768
+            grid[1][0] = 2
+            game = bitboard_game(grid)
+            self.assertEqual(game.get_mover().get_tile_bits(), BITBOARD_TILE_BITS)
+            for move in (LEFT, RIGHT):
+                game = bitboard_game(grid)
+                game.move(move)
+                self.assertTrue(game.get_mover().get_tile_bits() > BITBOARD_TILE_BITS)
+                self.assertEqual(max(max(row) for row in game.get_grid()), 65536)
+                self.assertEqual(game.get_grid(), [[game.get_tile(row, col)
+                                                    for col in range(grid_width)]
+                                                   for row in range(grid_height)])
+                game.reset()
+                self.assertEqual(game.get_mover().get_tile_bits(), BITBOARD_TILE_BITS)
+
+    def test_expectimax_beyond_32768(self):
+        grid = [[32768, 32768, 2, 4], [4, 8, 16, 32], [2, 4, 8, 16], [0, 2, 4, 8]]
+        game = bitboard_game(grid)
+        player = ExpectimaxPlayer(4, 4, max_depth=2)
+        self.assertTrue(player.get_move(game) in game.legal_moves())
+        game.set_tile(0, 0, 65536)
+        self.assertTrue(player.get_move(game) in game.legal_moves())
+
+    def test_random_games_match_list_engine(self):
+        for grid_height, grid_width in [(3, 3), (4, 4), (5, 6)]:
+            random.seed(grid_height * grid_width)
+            game = BitboardTwentyFortyEight(grid_height, grid_width)
+            while not game.is_game_over():
+                grid = game.get_grid()
+                direction = random.choice(game.legal_moves())
+                expected = list_slide(grid, direction)
+                game.move(direction)
+                changed = [(row, col) for row in range(grid_height) for col in range(grid_width)
+                           if game.get_tile(row, col) != expected[row][col]]
+                # the only difference is the spawned tile
+                self.assertEqual(len(changed), 1)
+                self.assertEqual(expected[changed[0][0]][changed[0][1]], 0)
+
+    def test_lazy_tables_are_bounded(self):
+        table_size = twenty_forty_eight.BITBOARD_LAZY_TABLE_SIZE
+        twenty_forty_eight.BITBOARD_LAZY_TABLE_SIZE = 64
+        try:
+            rng = random.Random(3)
+            mover = BitboardMover(6, 6)
+            for dummy_board in range(200):
+                mover.slide_all(bitboard_game(random_grid(rng, 6, 6)).get_board())
+            for table in twenty_forty_eight.get_line_tables(6, mover.get_tile_bits()):
+                self.assertTrue(len(table) <= 64)
+        finally:
+            twenty_forty_eight.BITBOARD_LAZY_TABLE_SIZE = table_size
+
+if __name__ == "__main__":
+    unittest.main()
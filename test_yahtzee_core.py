@@ -0,0 +1,114 @@
+"""
+Tests of the Yahtzee planner of yahtzee_core.py.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from yahtzee_core import strategy, build_strategy_table, gen_all_hands, StrategyTable
+from yahtzee_core import expected_value, expected_value_polynomial
+from yahtzee_core import score, gen_all_sequences, gen_all_holds, TurnPlanner
+
+# (number of dice, number of sides) of the small configurations
+CONFIGURATIONS = [(5, 6), (4, 4), (3, 8), (2, 3), (1, 6)]
+
+class ExpectedValueTest(unittest.TestCase):
+    """
+    The polynomial evaluator against the enumerating expected_value.
+    """
+
+    def test_polynomial_matches_enumeration(self):
+        for num_dice, num_die_sides in CONFIGURATIONS:
+            for num_held in range(num_dice + 1):
+                for held_dice in gen_all_hands(num_held, num_die_sides):
+                    self.assertEqual(
+                        expected_value_polynomial(held_dice, num_die_sides, num_dice - num_held),
+                        expected_value(held_dice, num_die_sides, num_dice - num_held))
+
+    def test_strategy_with_polynomial_evaluator(self):
+        for num_dice, num_die_sides in CONFIGURATIONS:
+            for hand in gen_all_hands(num_dice, num_die_sides):
+                self.assertEqual(strategy(hand, num_die_sides, expected_value_polynomial)[0],
+                                 strategy(hand, num_die_sides)[0])
+
+def brute_force_value(hand, rolls_left, num_die_sides, score_function, values):
+    """
+    Return the expected final score of a sorted hand with rolls_left
+    rolls remaining, trying every hold and every ordered roll.
+    """
+    key = (hand, rolls_left)
+    if key not in values:
+        if rolls_left == 0:
+            values[key] = float(score_function(hand))
+        else:
+            best_value = None
+            for hold in gen_all_holds(hand):
+                rolls = gen_all_sequences(range(1, num_die_sides + 1), len(hand) - len(hold))
+                value = sum(brute_force_value(tuple(sorted(hold + roll)), rolls_left - 1,
+                                              num_die_sides, score_function, values)
+                            for roll in rolls) / float(len(rolls))
+                if best_value is None or value > best_value:
+                    best_value = value
+            values[key] = best_value
+    return values[key]
+
+class TurnPlannerTest(unittest.TestCase):
+    """
+    The dynamic programming planner against a brute force recursion.
+    """
+
+    def test_values_match_brute_force(self):
+        for num_dice, num_die_sides, score_function in [(3, 4, score), (2, 3, score),
+                                                        (3, 3, sum), (1, 6, score)]:
+            planner = TurnPlanner(num_dice, num_die_sides, 3, score_function)
+            values = {}
+            for rolls_left in range(3):
+                for hand in gen_all_hands(num_dice, num_die_sides):
+                    expected = brute_force_value(hand, rolls_left, num_die_sides,
+                                                 score_function, values)
+                    self.assertAlmostEqual(planner.get_value(hand, rolls_left), expected, 12)
+                    if rolls_left > 0:
+                        value, hold = planner.strategy(hand, rolls_left)
+                        self.assertAlmostEqual(value, expected, 12)
+                        self.assertTrue(hold in [tuple(sorted(item))
+                                                 for item in gen_all_holds(hand)])
+            rolls = gen_all_sequences(range(1, num_die_sides + 1), num_dice)
+            turn_value = sum(brute_force_value(tuple(sorted(roll)), 2, num_die_sides,
+                                               score_function, values)
+                             for roll in rolls) / float(len(rolls))
+            self.assertAlmostEqual(planner.get_turn_value(), turn_value, 12)
+
+    def test_single_roll_matches_strategy(self):
+        planner = TurnPlanner(5, 6)
+        for hand in gen_all_hands(5, 6):
+            self.assertEqual(planner.strategy(hand)[0], strategy(hand, 6)[0])
+
+class StrategyTableTest(unittest.TestCase):
+    """
+    Lookups in strategy tables.
+    """
+
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._path = os.path.join(self._directory, "table")
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def test_table_matches_strategy(self):
+        build_strategy_table(self._path, 3, 4)
+        table = StrategyTable(self._path)
+        for hand in gen_all_hands(3, 4):
+            value, hold = strategy(hand, 4)
+            self.assertEqual(table.strategy(hand), (value, tuple(sorted(hold))))
+
+    def test_table_rejects_other_hands(self):
+        build_strategy_table(self._path, 3, 4)
+        table = StrategyTable(self._path)
+        for hand in [(1, 2), (1, 2, 3, 4), (1, 2, 5), (0, 1, 2), (3, 1, 2)]:
+            self.assertRaises(ValueError, table.strategy, hand)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,269 @@
+"""
+Self-play tournaments between 2048 move policies.
+
+A policy is a picklable function (or bound method) that takes a game
+and returns the direction to move in, or None to stop, e.g.
+random_policy or ExpectimaxPlayer(4, 4).get_move. Games are spread
+over a process pool and every game is seeded from its index alone, so
+results do not depend on which worker plays it and every policy meets
+the same sequence of seeds.
+"""
+
+import collections
+import math
+import random
+
+from process_pool import imap_tasks
+from twenty_forty_eight import TwentyFortyEight, UP, DOWN, LEFT, RIGHT
+
+GameResult = collections.namedtuple("GameResult",
+                                    ["policy", "game_index", "seed",
+                                     "score", "max_tile", "move_num"])
+# Distance between the seeds of two tournaments with consecutive base seeds
+SEED_STRIDE = 1000003
+CORNER_ORDER = [UP, LEFT, RIGHT, DOWN]
+
+def random_policy(game):
+    """
+    Move in a random direction that changes the grid.
+    """
+    legal_moves = game.legal_moves()
+    if len(legal_moves) == 0:
+        return None
+    return random.choice(legal_moves)
+
+def corner_policy(game):
+    """
+    Move up if possible, else left, else right, else down, which
+    keeps the large tiles in the upper left corner.
+    """
+    legal_moves = game.legal_moves()
+    for direction in CORNER_ORDER:
+        if direction in legal_moves:
+            return direction
+    return None
+
+def move_score(game, direction):
+    """
+    Return the sum of the tiles created by merges when the game
+    is moved in the given direction.
+    """
+    height = game.get_grid_height()
+    width = game.get_grid_width()
+    if direction == UP or direction == DOWN:
+        lines = [[game.get_tile(row, col) for row in range(height)] for col in range(width)]
+    else:
+        lines = [[game.get_tile(row, col) for col in range(width)] for row in range(height)]
+    score = 0
+    for line in lines:
+        tiles = [value for value in line if value != 0]
+        if direction == DOWN or direction == RIGHT:
+            tiles.reverse()
+        index = 0
+        while index < len(tiles) - 1:
+            if tiles[index] == tiles[index + 1]:
+                score += 2 * tiles[index]
+                index += 2
+            else:
+                index += 1
+    return score
+
+def game_seed(base_seed, game_index):
+    """
+    Return the seed of a game of the tournament.
+    """
+    return base_seed * SEED_STRIDE + game_index
+
+def play_game(policy, grid_height, grid_width, seed, max_moves=None):
+    """
+    Play one seeded game with the policy. The game ends when no
+    direction changes the grid, or when the policy returns None or a
+    direction that does not change the grid.
+
+    Returns a tuple (score, max tile, number of moves)
+    """
+    random.seed(seed)
+    game = TwentyFortyEight(grid_height, grid_width)
+    score = 0
+    move_num = 0
+    while max_moves is None or move_num < max_moves:
+        legal_moves = game.legal_moves()
+        if len(legal_moves) == 0:
+            break
+        direction = policy(game)
+        if direction not in legal_moves:
+            break
+        score += move_score(game, direction)
+        game.move(direction)
+        move_num += 1
+    max_tile = max(game.get_tile(row, col) for row in range(grid_height)
+                   for col in range(grid_width))
+    return (score, max_tile, move_num)
+
+def _play_task(task):
+    """
+    Play the game described by a task tuple in a worker process.
+    """
+    name, policy, game_index, seed, grid_height, grid_width, max_moves = task
+    score, max_tile, move_num = play_game(policy, grid_height, grid_width, seed, max_moves)
+    return GameResult(name, game_index, seed, score, max_tile, move_num)
+
+def iter_tournament(policies, num_games, grid_height=4, grid_width=4,
+                    base_seed=0, processes=None, max_moves=None, chunksize=8):
+    """
+    Play num_games games with every policy over a process pool.
+
+    policies: dictionary mapping policy names to policies
+    processes: number of worker processes (default: one per CPU);
+        0 plays every game in the calling process
+
+    Yields a GameResult for every game, in order of completion
+    """
+    tasks = ((name, policies[name], game_index, game_seed(base_seed, game_index),
+              grid_height, grid_width, max_moves)
+             for game_index in range(num_games)
+             for name in sorted(policies))
+    return imap_tasks(_play_task, tasks, processes, chunksize)
+
+class RunningStats:
+    """
+    Class to aggregate count, mean, standard deviation, minimum and
+    maximum of a stream of numbers in constant memory.
+    """
+
+    def __init__(self):
+        self._count = 0
+        self._mean = 0.0
+        # sum of squared differences from the mean (Welford's method)
+        self._squares = 0.0
+        self._min = None
+        self._max = None
+
+    def __str__(self):
+        """
+        Return a human readable summary.
+        """
+        return ("mean " + str(round(self.get_mean(), 2)) +
+                " std " + str(round(self.get_std(), 2)) +
+                " min " + str(self._min) + " max " + str(self._max))
+
+    def add(self, value):
+        """
+        Add a number to the statistics.
+        """
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / float(self._count)
+        self._squares += delta * (value - self._mean)
+        if self._min is None or value < self._min:
+            self._min = value
+        if self._max is None or value > self._max:
+            self._max = value
+
+    def get_count(self):
+        """
+        Return the number of values added.
+        """
+        return self._count
+
+    def get_mean(self):
+        """
+        Return the mean of the values.
+        """
+        return self._mean
+
+    def get_std(self):
+        """
+        Return the sample standard deviation of the values.
+        """
+        if self._count < 2:
+            return 0.0
+        return math.sqrt(self._squares / (self._count - 1))
+
+    def get_min(self):
+        """
+        Return the smallest value, or None.
+        """
+        return self._min
+
+    def get_max(self):
+        """
+        Return the largest value, or None.
+        """
+        return self._max
+
+class TournamentSummary:
+    """
+    Class to aggregate game results per policy as they arrive.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._max_tiles = {}
+
+    def __str__(self):
+        """
+        Return a human readable summary of every policy.
+        """
+        lines = []
+        for name in sorted(self._stats):
+            lines.append(name + " (" + str(self.get_stats(name, "score").get_count()) + " games)")
+            for field in ("score", "max_tile", "move_num"):
+                lines.append("  " + field + ": " + str(self.get_stats(name, field)))
+            lines.append("  max tiles: " + str(sorted(self._max_tiles[name].items())))
+        return "\n".join(lines)
+
+    def add(self, result):
+        """
+        Add one GameResult.
+        """
+        if result.policy not in self._stats:
+            self._stats[result.policy] = dict((field, RunningStats()) for field
+                                              in ("score", "max_tile", "move_num"))
+            self._max_tiles[result.policy] = {}
+        stats = self._stats[result.policy]
+        stats["score"].add(result.score)
+        stats["max_tile"].add(result.max_tile)
+        stats["move_num"].add(result.move_num)
+        tiles = self._max_tiles[result.policy]
+        tiles[result.max_tile] = tiles.get(result.max_tile, 0) + 1
+
+    def get_policies(self):
+        """
+        Return the sorted names of the policies seen so far.
+        """
+        return sorted(self._stats)
+
+    def get_stats(self, policy, field):
+        """
+        Return the RunningStats of a field ("score", "max_tile" or
+        "move_num") of a policy.
+        """
+        return self._stats[policy][field]
+
+    def get_max_tile_counts(self, policy):
+        """
+        Return a dictionary mapping each max tile to the number
+        of games of the policy that reached it.
+        """
+        return dict(self._max_tiles[policy])
+
+def run_tournament(policies, num_games, grid_height=4, grid_width=4,
+                   base_seed=0, processes=None, max_moves=None, callback=None):
+    """
+    Play a tournament and aggregate its results.
+
+    callback: optional function called with every GameResult as it arrives
+
+    Returns a TournamentSummary
+    """
+    summary = TournamentSummary()
+    for result in iter_tournament(policies, num_games, grid_height, grid_width,
+                                  base_seed, processes, max_moves):
+        summary.add(result)
+        if callback is not None:
+            callback(result)
+    return summary
+
+if __name__ == "__main__":
+    print(run_tournament({"random": random_policy, "corner": corner_policy}, 200))
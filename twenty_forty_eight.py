@@ -0,0 +1,1421 @@
+"""
+Game logic of the 2048 clone, importable without the GUI.
+"""
+
+import random
+import time
+import collections
+import array
+
+from optional_numpy import import_numpy
+
+SQUARE_VALUE = [2, 2, 2, 2, 2, 2, 2, 2, 2, 4]
+TILE_INTIALIZED = 2
+# Directions, DO NOT MODIFY
+UP = 1
+DOWN = 2
+LEFT = 3
+RIGHT = 4
+
+# Offsets for computing tile indices in each direction.
+# DO NOT MODIFY this dictionary.
+OFFSETS = {UP: (1, 0),
+           DOWN: (-1, 0),
+           LEFT: (0, 1),
+           RIGHT: (0, -1)}
+
+def merge(line):
+    """
+    Helper function that merges a single row or column in 2048
+    """
+    output = list(line)
+    return_list = list(line)
+    for output_index in range(len(line)):
+        output[output_index] = 0
+        return_list[output_index] = 0
+    output_valuenum = 0
+    # create an output list that has all of the non-zero tiles slid over 
+    # to the beginning of the list with the appropriate number of zeroes 
+    # at the end of the list.
+    for line_value in line:
+        if line_value != 0:
+            output[output_valuenum] = line_value
+            output_valuenum += 1
+    
+    # Iterate over the list created in the previous step and create another new list
+    # in which pairs of tiles in the first list are replaced with a tile of twice 
+    # the value and a zero tile.
+    return_list_index = 0
+    for output_index in range(len(output)):
+        if output[output_index] == 0:
+            continue
+        else:    
+            if output_index != len(output)-1 and output[output_index] == output[output_index+1]:
+                return_list[return_list_index] = 2 * output[output_index]
+                output[output_index+1] = 0
+                return_list_index += 1  
+            else:
+                return_list[return_list_index] = output[output_index]
+                return_list_index += 1    
+    return return_list
+
+def line_moves(line):
+    """
+    Helper function that tells, without merging, whether a single
+    row or column changes when merged towards its first tile and
+    towards its last tile.
+
+    Returns a tuple of two booleans
+    """
+    toward_first = False
+    toward_last = False
+    for index in range(len(line) - 1):
+        value = line[index]
+        next_value = line[index + 1]
+        if value == 0:
+            if next_value != 0:
+                toward_first = True
+        elif next_value == 0:
+            toward_last = True
+        elif value == next_value:
+            return (True, True)
+    return (toward_first, toward_last)
+
+class TwentyFortyEight:
+    """
+    Class to run the game logic.
+    """
+
+    def __init__(self, grid_height, grid_width):
+        self._height = grid_height
+        self._width = grid_width
+        self.reset()
+        
+        # create indices for UP, DOWN, LEFT, RIGHT
+        grid_by_row = [[(dummy_row, dummy_col) for dummy_col in range(self._width)]
+                                               for dummy_row in range(self._height)]
+        grid_by_col = [[(dummy_row, dummy_col) for dummy_row in range(self._height)]
+                                               for dummy_col in range(self._width)]
+        self._indices = {UP: grid_by_row[0],
+                         DOWN: grid_by_row[self._height-1],
+                         LEFT: grid_by_col[0],
+                         RIGHT: grid_by_col[self._width-1]}
+        # get the len of tiles to be merged for UP, DOWN, LEFT, RIGHT
+        self._mergelist_len = {UP: self._height,
+                               DOWN: self._height,
+                               LEFT: self._width,
+                               RIGHT: self._width}
+    def reset(self):
+        """
+        Reset the game so the grid is empty except for two
+        initial tiles.
+        """
+        self._grid = [[ 0 for dummy_col in range(self._width)]
+                          for dummy_row in range(self._height)]
+        # keep the empty squares in a list, with the position of every
+        # square in the list, so squares are added and removed in O(1)
+        self._empty_squares = [(row, col) for row in range(self._height)
+                                          for col in range(self._width)]
+        self._empty_index = dict((square, index) for index, square
+                                 in enumerate(self._empty_squares))
+        self._last_spawn = None
+        # line_moves() of every row and column, None until computed
+        self._row_moves = [None for dummy_row in range(self._height)]
+        self._col_moves = [None for dummy_col in range(self._width)]
+        for dummy_index in range(TILE_INTIALIZED):
+            self.new_tile()
+
+    def __str__(self):
+        """
+        Return a string representation of the grid for debugging.
+        """
+        return str(self._grid)
+
+    def get_empty_squares(self):
+        """
+        Return a list of the empty squares as (row, col) tuples.
+        """
+        return list(self._empty_squares)
+
+    def get_last_spawn(self):
+        """
+        Return (row, col, value) of the tile created by the last
+        move, or None if it created no tile.
+        """
+        return self._last_spawn
+
+    def get_grid_height(self):
+        """
+        Get the height of the board.
+        """
+        return self._height
+
+    def get_grid_width(self):
+        """
+        Get the width of the board.
+        """
+        return self._width
+
+    def legal_moves(self):
+        """
+        Return the list of directions that would change the grid,
+        without changing it.
+        """
+        can_move = {UP: False, DOWN: False, LEFT: False, RIGHT: False}
+        for row in range(self._height):
+            if self._row_moves[row] is None:
+                self._row_moves[row] = line_moves(self._grid[row])
+            can_move[LEFT] |= self._row_moves[row][0]
+            can_move[RIGHT] |= self._row_moves[row][1]
+        for col in range(self._width):
+            if self._col_moves[col] is None:
+                self._col_moves[col] = line_moves([grid_row[col] for grid_row in self._grid])
+            can_move[UP] |= self._col_moves[col][0]
+            can_move[DOWN] |= self._col_moves[col][1]
+        return [direction for direction in sorted(can_move) if can_move[direction]]
+
+    def is_game_over(self):
+        """
+        Return True if no direction changes the grid.
+        """
+        if len(self._empty_squares) > 0:
+            # an empty square next to a tile always allows some move
+            if len(self._empty_squares) < self._height * self._width:
+                return False
+        return len(self.legal_moves()) == 0
+
+    def move(self, direction):
+        """
+        Move all tiles in the given direction and add
+        a new tile if any tiles moved.
+        """
+        tile_changed = False
+        self._last_spawn = None
+        offset = OFFSETS[direction]
+        indice =  self._indices[direction]
+        tem_list =[0 for dummy_row in range(self._mergelist_len[direction])]
+        # iterate over the entries of the associated row or column starting at the 
+        # specified initial tile according to the direction
+        for square in indice:
+            # store the tile values into a temporary list
+            for index in range(self._mergelist_len[direction]):
+                row = square[0] + index * offset[0]
+                col = square[1] + index * offset[1]
+                tem_list[index] = self.get_tile(row, col)
+            # merge the temporary list    
+            merged_list = merge(tem_list)
+            # store the merged tile values back into the grid
+            for index in range(self._mergelist_len[direction]):
+                row = square[0] + index * offset[0]
+                col = square[1] + index * offset[1]
+                if self._grid[row][col]!= merged_list[index]:
+                    tile_changed = True
+                self.set_tile(row, col,merged_list[index])
+        if tile_changed:
+            self.new_tile()
+                
+    def new_tile(self):
+        """
+        Create a new tile in a randomly selected empty
+        square.  The tile should be 2 90% of the time and
+        4 10% of the time.
+        """
+        if len(self._empty_squares) == 0:
+            return
+        row, col = random.choice(self._empty_squares)
+        value = random.choice(SQUARE_VALUE)
+        self.set_tile(row, col, value)
+        self._last_spawn = (row, col, value)
+
+    def set_tile(self, row, col, value):
+        """
+        Set the tile at position row, col to have the given value.
+        """
+        old_value = self._grid[row][col]
+        if old_value == value:
+            return
+        self._grid[row][col] = value
+        self._row_moves[row] = None
+        self._col_moves[col] = None
+        if old_value == 0 and value != 0:
+            # move the last empty square into the removed one's slot
+            index = self._empty_index.pop((row, col))
+            last_square = self._empty_squares.pop()
+            if last_square != (row, col):
+                self._empty_squares[index] = last_square
+                self._empty_index[last_square] = index
+        elif old_value != 0 and value == 0:
+            self._empty_index[(row, col)] = len(self._empty_squares)
+            self._empty_squares.append((row, col))
+
+    def get_tile(self, row, col):
+        """
+        Return the value of the tile at position row, col.
+        """
+        return self._grid[row][col]
+
+# Packed board representation: every tile is stored as a log2 code
+# (0 for an empty square, 1 for 2, 2 for 4, ...). The engine and the
+# search players use 4-bit codes, so that a 4x4 board fits in 64 bits
+# and its rows in fully precomputed tables, and switch to wider codes
+# when a tile beyond 32768 appears.
+BITBOARD_TILE_BITS = 4
+# Tables indexed by up to this many bits are fully precomputed
+# (2 ** 16 = 65536 entries); tables of longer lines are filled in on
+# demand from the precomputed tables of their pieces.
+BITBOARD_FULL_TABLE_BITS = 16
+# Number of entries after which a table filled in on demand starts
+# over, so that long running processes do not grow without limit
+BITBOARD_LAZY_TABLE_SIZE = 1 << 18
+# Table entry for a line whose merge would overflow its tile codes,
+# negative so that it makes the whole moved board negative
+BITBOARD_OVERFLOW = -1
+
+class BitboardOverflowError(ValueError):
+    """
+    Raised when a tile does not fit in the codes of a packed board.
+    """
+    pass
+
+def bitboard_tile_bits(grid_height, grid_width):
+    """
+    Return the number of bits of the tile codes of a board, enough
+    for every tile the board can reach: a board of n squares can
+    reach 2 ** (n + 1).
+    """
+    return max(BITBOARD_TILE_BITS, (grid_height * grid_width + 1).bit_length())
+
+def encode_tile(value, tile_bits=BITBOARD_TILE_BITS):
+    """
+    Return the log2 code of a tile value.
+    """
+    if value == 0:
+        return 0
+    code = value.bit_length() - 1
+    if code >= 1 << tile_bits:
+        raise BitboardOverflowError("tile value " + str(value) + " does not fit in " +
+                                    str(tile_bits) + "-bit codes")
+    return code
+
+def decode_tile(code):
+    """
+    Return the tile value of a log2 code.
+    """
+    if code == 0:
+        return 0
+    return 1 << code
+
+def _merge_piece(codes, tile_bits):
+    """
+    Helper function that merges a list of non-zero tile codes towards
+    its first code like merge(): equal neighbours merge into the next
+    code, and every tile merges at most once. The last code is left
+    pending when it did not merge, since it could still merge with
+    the codes that follow the piece.
+
+    Returns (merged codes, pending code or 0), or None if a code
+    overflows tile_bits
+    """
+    merged = []
+    code_num = len(codes)
+    index = 0
+    while index + 1 < code_num:
+        code = codes[index]
+        if codes[index + 1] == code:
+            code += 1
+            if code >> tile_bits:
+                return None
+            index += 2
+        else:
+            index += 1
+        merged.append(code)
+    if index < code_num:
+        return (merged, codes[index])
+    return (merged, 0)
+
+def _line_codes(line_code, line_len, tile_bits, backward):
+    """
+    Helper function that returns the non-zero codes of a packed line,
+    from its first tile or, for a backward move, from its last tile.
+    """
+    tile_mask = (1 << tile_bits) - 1
+    if backward:
+        indices = range(line_len - 1, -1, -1)
+    else:
+        indices = range(line_len)
+    codes = [(line_code >> (index * tile_bits)) & tile_mask for index in indices]
+    return [code for code in codes if code]
+
+def _pack_codes(codes, line_len, tile_bits, backward):
+    """
+    Helper function that packs codes from the first tile of a line
+    or, for a backward move, from its last tile.
+    """
+    packed_code = 0
+    for index, code in enumerate(codes):
+        if backward:
+            index = line_len - 1 - index
+        packed_code |= code << (index * tile_bits)
+    return packed_code
+
+def _merge_line_code(line_code, line_len, tile_bits, backward):
+    """
+    Helper function that merges a packed line towards its first tile
+    or, for a backward move, towards its last tile, with the same
+    result as merge(), and returns the packed result
+    """
+    piece = _merge_piece(_line_codes(line_code, line_len, tile_bits, backward), tile_bits)
+    if piece is None:
+        return BITBOARD_OVERFLOW
+    merged, pending = piece
+    if pending:
+        merged.append(pending)
+    return _pack_codes(merged, line_len, tile_bits, backward)
+
+def _merge_chunk_code(key, chunk_len, tile_bits, backward):
+    """
+    Helper function for the tables of line pieces: key holds the codes
+    of a piece of chunk_len tiles, below the code left pending by the
+    pieces moved before it.
+
+    Returns (packed merged codes, number of merged codes, pending code),
+    where a backward move packs the merged codes from the last one
+    """
+    chunk_bits = chunk_len * tile_bits
+    codes = [key >> chunk_bits]
+    codes.extend(_line_codes(key & ((1 << chunk_bits) - 1), chunk_len, tile_bits, backward))
+    piece = _merge_piece([code for code in codes if code], tile_bits)
+    if piece is None:
+        return BITBOARD_OVERFLOW
+    merged, pending = piece
+    return (_pack_codes(merged, len(merged), tile_bits, backward), len(merged), pending)
+
+def _merge_line_chunks(line_code, line_len, tile_bits, backward, chunk_len, chunk_table):
+    """
+    Helper function with the result of _merge_line_code(), computed a
+    piece of the line at a time with a table of _merge_chunk_code().
+    """
+    chunk_bits = chunk_len * tile_bits
+    chunk_mask = (1 << chunk_bits) - 1
+    chunk_shifts = range(0, line_len * tile_bits, chunk_bits)
+    if backward:
+        chunk_shifts = reversed(chunk_shifts)
+    merged_code = 0
+    merged_num = 0
+    pending = 0
+    for chunk_shift in chunk_shifts:
+        entry = chunk_table[(pending << chunk_bits) | ((line_code >> chunk_shift) & chunk_mask)]
+        if entry == BITBOARD_OVERFLOW:
+            return BITBOARD_OVERFLOW
+        chunk_code, chunk_num, pending = entry
+        if backward:
+            merged_code |= chunk_code << ((line_len - merged_num - chunk_num) * tile_bits)
+        else:
+            merged_code |= chunk_code << (merged_num * tile_bits)
+        merged_num += chunk_num
+    if pending:
+        return merged_code | (pending << ((line_len - 1 - merged_num if backward
+                                           else merged_num) * tile_bits))
+    return merged_code
+
+def _spread_line_code(line_code, line_len, tile_bits, stride):
+    """
+    Move tile index of a packed line to tile index * stride, which
+    turns a row into a column of a board with rows of stride tiles.
+    """
+    tile_mask = (1 << tile_bits) - 1
+    spread_code = 0
+    for index in range(line_len):
+        tile = (line_code >> (index * tile_bits)) & tile_mask
+        spread_code |= tile << (index * stride * tile_bits)
+    return spread_code
+
+class _LazyTable(dict):
+    """
+    Table for long lines, where precomputing every entry would be too
+    expensive: entries are computed the first time they are used, and
+    the table starts over when it holds BITBOARD_LAZY_TABLE_SIZE entries.
+    """
+
+    def __init__(self, function, *args):
+        dict.__init__(self)
+        self._function = function
+        self._args = args
+
+    def __missing__(self, key):
+        if len(self) >= BITBOARD_LAZY_TABLE_SIZE:
+            self.clear()
+        value = self._function(key, *self._args)
+        self[key] = value
+        return value
+
+def _make_table(function, key_bits, *args):
+    """
+    Return the table of function over every key of key_bits bits, as
+    a list for short keys and as a _LazyTable for long ones.
+    """
+    if key_bits <= BITBOARD_FULL_TABLE_BITS:
+        return [function(key, *args) for key in range(1 << key_bits)]
+    return _LazyTable(function, *args)
+
+def _piece_len(line_len, tile_bits):
+    """
+    Return the number of tiles of the pieces a line is cut into, so
+    that every piece fits in a fully precomputed table.
+    """
+    piece_num = -(-line_len * tile_bits // BITBOARD_FULL_TABLE_BITS)
+    return -(-line_len // piece_num)
+
+_LINE_TABLES = {}
+_CHUNK_TABLES = {}
+_SPREAD_TABLES = {}
+
+def _get_chunk_table(chunk_len, tile_bits, backward):
+    """
+    Return the shared table of _merge_chunk_code().
+    """
+    key = (chunk_len, tile_bits, backward)
+    if key not in _CHUNK_TABLES:
+        _CHUNK_TABLES[key] = _make_table(_merge_chunk_code, (chunk_len + 1) * tile_bits,
+                                         chunk_len, tile_bits, backward)
+    return _CHUNK_TABLES[key]
+
+def get_line_tables(line_len, tile_bits=BITBOARD_TILE_BITS):
+    """
+    Return the pair of move tables (towards the first tile, towards the
+    last tile) for packed lines of the given length. Tables are shared
+    between all boards.
+    """
+    key = (line_len, tile_bits)
+    if key not in _LINE_TABLES:
+        tables = []
+        for backward in (False, True):
+            if line_len * tile_bits <= BITBOARD_FULL_TABLE_BITS:
+                tables.append(_make_table(_merge_line_code, line_len * tile_bits,
+                                          line_len, tile_bits, backward))
+            else:
+                # a piece and the code pending before it index a small
+                # table, so that it is cheap to build in every process
+                chunk_len = max(1, BITBOARD_FULL_TABLE_BITS // 2 // tile_bits)
+                tables.append(_LazyTable(_merge_line_chunks, line_len, tile_bits, backward,
+                                         chunk_len,
+                                         _get_chunk_table(chunk_len, tile_bits, backward)))
+        _LINE_TABLES[key] = tuple(tables)
+    return _LINE_TABLES[key]
+
+def _get_spread_table(line_len, tile_bits, stride):
+    """
+    Return the shared table of _spread_line_code() for packed lines.
+    """
+    key = (line_len, tile_bits, stride)
+    if key not in _SPREAD_TABLES:
+        _SPREAD_TABLES[key] = _make_table(_spread_line_code, line_len * tile_bits,
+                                          line_len, tile_bits, stride)
+    return _SPREAD_TABLES[key]
+
+class BitboardMover:
+    """
+    Class to slide packed boards of a given size, without spawning
+    tiles. Shared by the bitboard engine and the search players.
+
+    Rows are moved with one table lookup each. Columns are moved by
+    transposing the board with one lookup per piece of line, moving
+    the rows of the transposed board and transposing it back.
+    """
+
+    def __init__(self, grid_height, grid_width, tile_bits=None):
+        """
+        tile_bits: number of bits of a tile code (default:
+            bitboard_tile_bits(), enough for every reachable tile)
+        """
+        if tile_bits is None:
+            tile_bits = bitboard_tile_bits(grid_height, grid_width)
+        self._height = grid_height
+        self._width = grid_width
+        self._tile_bits = tile_bits
+        self._tile_mask = (1 << tile_bits) - 1
+        # bit offset of every tile, row by row
+        self._shifts = [[(row * grid_width + col) * tile_bits
+                         for col in range(grid_width)]
+                        for row in range(grid_height)]
+        self._all_shifts = [shift for row_shifts in self._shifts for shift in row_shifts]
+        # lowest bit of every tile
+        self._low_bits = sum(1 << shift for shift in self._all_shifts)
+        self._row_mask = (1 << (grid_width * tile_bits)) - 1
+        self._col_mask = (1 << (grid_height * tile_bits)) - 1
+        self._row_shifts = [row * grid_width * tile_bits for row in range(grid_height)]
+        self._col_shifts = [col * grid_height * tile_bits for col in range(grid_width)]
+        self._row_pieces, self._row_spread = self._make_pieces(grid_height, grid_width)
+        self._col_pieces, self._col_spread = self._make_pieces(grid_width, grid_height)
+        # get the move tables for UP, DOWN, LEFT, RIGHT
+        row_tables = get_line_tables(grid_width, tile_bits)
+        col_tables = get_line_tables(grid_height, tile_bits)
+        self._tables = {UP: col_tables[0],
+                        DOWN: col_tables[1],
+                        LEFT: row_tables[0],
+                        RIGHT: row_tables[1]}
+
+    def _make_pieces(self, line_num, line_len):
+        """
+        Return the pieces of the lines of a board of line_num lines
+        of line_len tiles, as (offset, mask, offset once transposed),
+        and the spread table that transposes them.
+        """
+        piece_len = _piece_len(line_len, self._tile_bits)
+        pieces = []
+        for line in range(line_num):
+            for start in range(0, line_len, piece_len):
+                tile_num = min(piece_len, line_len - start)
+                pieces.append(((line * line_len + start) * self._tile_bits,
+                               (1 << (tile_num * self._tile_bits)) - 1,
+                               (start * line_num + line) * self._tile_bits))
+        return (pieces, _get_spread_table(piece_len, self._tile_bits, line_num))
+
+    def get_tile_bits(self):
+        """
+        Return the number of bits of a tile code.
+        """
+        return self._tile_bits
+
+    def get_shift(self, row, col):
+        """
+        Return the bit offset of the tile at position row, col.
+        """
+        return self._shifts[row][col]
+
+    def encode(self, value):
+        """
+        Return the code of a tile value.
+        """
+        return encode_tile(value, self._tile_bits)
+
+    def get_code(self, board, row, col):
+        """
+        Return the code of the tile at position row, col of a packed board.
+        """
+        return (board >> self._shifts[row][col]) & self._tile_mask
+
+    def pack(self, game):
+        """
+        Return the packed board of any game exposing get_tile().
+        """
+        board = 0
+        for row in range(self._height):
+            for col in range(self._width):
+                board |= self.encode(game.get_tile(row, col)) << self._shifts[row][col]
+        return board
+
+    def empty_bits(self, board):
+        """
+        Return the lowest bit of every empty square of a packed board.
+        """
+        occupied = board
+        for bit in range(1, self._tile_bits):
+            occupied |= board >> bit
+        return self._low_bits & ~occupied
+
+    def has_empty(self, board):
+        """
+        Return True if a packed board has an empty square.
+        """
+        return self.empty_bits(board) != 0
+
+    def empty_shifts(self, board):
+        """
+        Return the bit offsets of the empty squares of a packed board.
+        """
+        tile_mask = self._tile_mask
+        return [shift for shift in self._all_shifts if (board >> shift) & tile_mask == 0]
+
+    def unpack(self, board):
+        """
+        Return the tile codes of a packed board as a list of rows.
+        """
+        tile_mask = self._tile_mask
+        return [[(board >> shift) & tile_mask for shift in row_shifts]
+                for row_shifts in self._shifts]
+
+    def _transpose(self, board, pieces, spread):
+        """
+        Return the board with its rows turned into columns, given
+        the pieces of its rows and their spread table.
+        """
+        transposed = 0
+        for piece_shift, piece_mask, spread_shift in pieces:
+            transposed |= spread[(board >> piece_shift) & piece_mask] << spread_shift
+        return transposed
+
+    def _slide_lines(self, board, line_shifts, line_mask, table):
+        """
+        Return the board after moving each of its lines with table.
+        """
+        new_board = 0
+        for line_shift in line_shifts:
+            new_board |= table[(board >> line_shift) & line_mask] << line_shift
+        if new_board < 0:
+            raise BitboardOverflowError("merged tile does not fit in " +
+                                        str(self._tile_bits) + "-bit codes")
+        return new_board
+
+    def slide(self, board, direction):
+        """
+        Return the packed board after moving all tiles in the
+        given direction.
+        """
+        if direction == LEFT or direction == RIGHT:
+            return self._slide_lines(board, self._row_shifts, self._row_mask,
+                                     self._tables[direction])
+        transposed = self._transpose(board, self._row_pieces, self._row_spread)
+        transposed = self._slide_lines(transposed, self._col_shifts, self._col_mask,
+                                       self._tables[direction])
+        return self._transpose(transposed, self._col_pieces, self._col_spread)
+
+    def slide_all(self, board):
+        """
+        Return a dictionary mapping every direction to the packed
+        board after moving all tiles in that direction, transposing
+        the board only once.
+        """
+        slides = {}
+        for direction in (LEFT, RIGHT):
+            slides[direction] = self._slide_lines(board, self._row_shifts, self._row_mask,
+                                                  self._tables[direction])
+        transposed = self._transpose(board, self._row_pieces, self._row_spread)
+        for direction in (UP, DOWN):
+            moved = self._slide_lines(transposed, self._col_shifts, self._col_mask,
+                                      self._tables[direction])
+            slides[direction] = self._transpose(moved, self._col_pieces, self._col_spread)
+        return slides
+
+class BitboardTwentyFortyEight:
+    """
+    Class to run the game logic on a packed board: the grid is a single
+    integer holding a 4-bit log2 code per tile (64 bits for 4x4), and
+    moves are lookups in precomputed merge() tables. When a tile beyond
+    32768 appears, the board switches to codes wide enough for every
+    tile it can reach.
+    """
+
+    def __init__(self, grid_height, grid_width):
+        self._height = grid_height
+        self._width = grid_width
+        self._narrow_mover = BitboardMover(grid_height, grid_width, BITBOARD_TILE_BITS)
+        self.reset()
+
+    def reset(self):
+        """
+        Reset the game so the grid is empty except for two
+        initial tiles.
+        """
+        self._mover = self._narrow_mover
+        self.set_board(0)
+        for dummy_index in range(TILE_INTIALIZED):
+            self.new_tile()
+
+    def __str__(self):
+        """
+        Return a string representation of the grid for debugging.
+        """
+        return str(self.get_grid())
+
+    def get_grid_height(self):
+        """
+        Get the height of the board.
+        """
+        return self._height
+
+    def get_grid_width(self):
+        """
+        Get the width of the board.
+        """
+        return self._width
+
+    def get_mover(self):
+        """
+        Return the BitboardMover of the packed board, which changes
+        when the board switches to wider codes.
+        """
+        return self._mover
+
+    def get_board(self):
+        """
+        Return the packed board, in the codes of get_mover().
+        """
+        return self._board
+
+    def set_board(self, board):
+        """
+        Replace the packed board, given in the codes of get_mover().
+        """
+        self._board = board
+        # slide_all() of the board, None until computed
+        self._slides = None
+
+    def _widen(self, error):
+        """
+        Switch the board to codes wide enough for every tile it can
+        reach, after error reported a tile overflowing its codes.
+        Re-raises error if the codes are already that wide.
+        """
+        mover = BitboardMover(self._height, self._width)
+        if mover.get_tile_bits() <= self._mover.get_tile_bits():
+            raise error
+        codes = self._mover.unpack(self._board)
+        board = 0
+        for row in range(self._height):
+            for col in range(self._width):
+                board |= codes[row][col] << mover.get_shift(row, col)
+        self._mover = mover
+        self.set_board(board)
+
+    def _get_slides(self):
+        """
+        Return slide_all() of the board, computed once per board.
+        """
+        if self._slides is None:
+            try:
+                self._slides = self._mover.slide_all(self._board)
+            except BitboardOverflowError as error:
+                self._widen(error)
+                self._slides = self._mover.slide_all(self._board)
+        return self._slides
+
+    def get_grid(self):
+        """
+        Return the board as a list of rows of tile values.
+        """
+        return [[self.get_tile(row, col) for col in range(self._width)]
+                for row in range(self._height)]
+
+    def legal_moves(self):
+        """
+        Return the list of directions that would change the grid,
+        without changing it.
+        """
+        slides = self._get_slides()
+        board = self._board
+        return [direction for direction in sorted(OFFSETS)
+                if slides[direction] != board]
+
+    def is_game_over(self):
+        """
+        Return True if no direction changes the grid.
+        """
+        # an empty square next to a tile always allows some move
+        if self._board != 0 and self._mover.has_empty(self._board):
+            return False
+        return len(self.legal_moves()) == 0
+
+    def move(self, direction):
+        """
+        Move all tiles in the given direction and add
+        a new tile if any tiles moved.
+        """
+        if self._slides is None:
+            try:
+                new_board = self._mover.slide(self._board, direction)
+            except BitboardOverflowError as error:
+                self._widen(error)
+                new_board = self._mover.slide(self._board, direction)
+        else:
+            new_board = self._slides[direction]
+        if new_board != self._board:
+            self.set_board(new_board)
+            self.new_tile()
+
+    def new_tile(self):
+        """
+        Create a new tile in a randomly selected empty
+        square.  The tile should be 2 90% of the time and
+        4 10% of the time.
+        """
+        empty_bits = self._mover.empty_bits(self._board)
+        if empty_bits == 0:
+            return
+        # the same draw as random.choice(self._mover.empty_shifts(board))
+        for dummy_index in range(random.randrange(bin(empty_bits).count("1"))):
+            empty_bits &= empty_bits - 1
+        shift = (empty_bits & -empty_bits).bit_length() - 1
+        self.set_board(self._board | (self._mover.encode(random.choice(SQUARE_VALUE)) << shift))
+
+    def set_tile(self, row, col, value):
+        """
+        Set the tile at position row, col to have the given value.
+        """
+        try:
+            code = self._mover.encode(value)
+        except BitboardOverflowError as error:
+            self._widen(error)
+            code = self._mover.encode(value)
+        shift = self._mover.get_shift(row, col)
+        tile_mask = (1 << self._mover.get_tile_bits()) - 1
+        self.set_board((self._board & ~(tile_mask << shift)) | (code << shift))
+
+    def get_tile(self, row, col):
+        """
+        Return the value of the tile at position row, col.
+        """
+        return decode_tile(self._mover.get_code(self._board, row, col))
+
+def merge_tiles(tiles, line_len):
+    """
+    Helper function that merges a line given as the list of its
+    non-zero tiles, in order, and pads the result with zeroes to
+    line_len. Same result as merge() on the full line.
+    """
+    merged = []
+    tile_num = len(tiles)
+    index = 0
+    while index < tile_num:
+        value = tiles[index]
+        if index + 1 < tile_num and tiles[index + 1] == value:
+            merged.append(2 * value)
+            index += 2
+        else:
+            merged.append(value)
+            index += 1
+    merged.extend([0] * (line_len - len(merged)))
+    return merged
+
+class LargeTwentyFortyEight:
+    """
+    Class to run the game logic on large boards: the grid is a flat
+    typed array stored row by row, and every row or column is read
+    and written back as one slice, so a move costs time linear in the
+    number of squares.
+    """
+
+    def __init__(self, grid_height, grid_width):
+        self._height = grid_height
+        self._width = grid_width
+        self.reset()
+
+    def reset(self):
+        """
+        Reset the game so the grid is empty except for two
+        initial tiles.
+        """
+        self._grid = array.array("l", [0]) * (self._height * self._width)
+        self._empty_num = self._height * self._width
+        for dummy_index in range(TILE_INTIALIZED):
+            self.new_tile()
+
+    def __str__(self):
+        """
+        Return a string representation of the grid for debugging.
+        """
+        return str(self.get_grid())
+
+    def get_grid_height(self):
+        """
+        Get the height of the board.
+        """
+        return self._height
+
+    def get_grid_width(self):
+        """
+        Get the width of the board.
+        """
+        return self._width
+
+    def get_grid(self):
+        """
+        Return the board as a list of rows of tile values.
+        """
+        width = self._width
+        return [self._grid[row * width:(row + 1) * width].tolist()
+                for row in range(self._height)]
+
+    def _line_slices(self, direction):
+        """
+        Return the slices of the flat grid covering every row (LEFT,
+        RIGHT) or column (UP, DOWN), each running from the tile the
+        line merges towards to the opposite edge.
+        """
+        height = self._height
+        width = self._width
+        if direction == LEFT:
+            return [slice(row * width, (row + 1) * width) for row in range(height)]
+        if direction == RIGHT:
+            return [slice((row + 1) * width - 1, row * width - 1 if row > 0 else None, -1)
+                    for row in range(height)]
+        if direction == UP:
+            return [slice(col, height * width, width) for col in range(width)]
+        return [slice((height - 1) * width + col, col - 1 if col > 0 else None, -width)
+                for col in range(width)]
+
+    def legal_moves(self):
+        """
+        Return the list of directions that would change the grid,
+        without changing it.
+        """
+        grid = self._grid
+        legal = []
+        for direction, opposite in ((UP, DOWN), (LEFT, RIGHT)):
+            toward_first = False
+            toward_last = False
+            for line_slice in self._line_slices(direction):
+                line_first, line_last = line_moves(grid[line_slice])
+                toward_first |= line_first
+                toward_last |= line_last
+                if toward_first and toward_last:
+                    break
+            if toward_first:
+                legal.append(direction)
+            if toward_last:
+                legal.append(opposite)
+        return sorted(legal)
+
+    def is_game_over(self):
+        """
+        Return True if no direction changes the grid.
+        """
+        if 0 < self._empty_num < self._height * self._width:
+            return False
+        return len(self.legal_moves()) == 0
+
+    def move(self, direction):
+        """
+        Move all tiles in the given direction and add
+        a new tile if any tiles moved.
+        """
+        grid = self._grid
+        tile_changed = False
+        for line_slice in self._line_slices(direction):
+            line = grid[line_slice]
+            tiles = [value for value in line if value]
+            if len(tiles) == 0:
+                continue
+            merged = array.array("l", merge_tiles(tiles, len(line)))
+            if merged != line:
+                grid[line_slice] = merged
+                tile_changed = True
+        if tile_changed:
+            self._empty_num = grid.count(0)
+            self.new_tile()
+
+    def new_tile(self):
+        """
+        Create a new tile in a randomly selected empty
+        square.  The tile should be 2 90% of the time and
+        4 10% of the time.
+        """
+        grid = self._grid
+        if self._empty_num == 0:
+            return
+        if 2 * self._empty_num >= len(grid):
+            # at least half of the squares are empty, so a random
+            # square is empty within two draws on average
+            square = random.randrange(len(grid))
+            while grid[square] != 0:
+                square = random.randrange(len(grid))
+        else:
+            square = random.choice([index for index, value in enumerate(grid) if value == 0])
+        grid[square] = random.choice(SQUARE_VALUE)
+        self._empty_num -= 1
+
+    def set_tile(self, row, col, value):
+        """
+        Set the tile at position row, col to have the given value.
+        """
+        square = row * self._width + col
+        if self._grid[square] == 0:
+            self._empty_num -= 1
+        if value == 0:
+            self._empty_num += 1
+        self._grid[square] = value
+
+    def get_tile(self, row, col):
+        """
+        Return the value of the tile at position row, col.
+        """
+        return self._grid[row * self._width + col]
+
+class BatchTwentyFortyEight:
+    """
+    Class to run the game logic on many boards at once. The boards are
+    held in one NumPy array of shape (num_games, grid_height, grid_width)
+    and every operation is applied to all of them as array operations.
+    """
+
+    def __init__(self, num_games, grid_height, grid_width, seed=None):
+        # NumPy is only needed by the batch engine
+        self._numpy = import_numpy("BatchTwentyFortyEight")
+        numpy = self._numpy
+        self._num_games = num_games
+        self._height = grid_height
+        self._width = grid_width
+        self._rng = numpy.random.default_rng(seed)
+        self._square_values = numpy.array(SQUARE_VALUE, dtype=numpy.int64)
+        self.reset()
+
+    def reset(self):
+        """
+        Reset every game so its grid is empty except for two
+        initial tiles.
+        """
+        numpy = self._numpy
+        self._grids = numpy.zeros((self._num_games, self._height, self._width),
+                                  dtype=numpy.int64)
+        for dummy_index in range(TILE_INTIALIZED):
+            self.new_tile()
+
+    def __str__(self):
+        """
+        Return a string representation of the grids for debugging.
+        """
+        return str(self._grids)
+
+    def get_num_games(self):
+        """
+        Get the number of boards.
+        """
+        return self._num_games
+
+    def get_grid_height(self):
+        """
+        Get the height of the boards.
+        """
+        return self._height
+
+    def get_grid_width(self):
+        """
+        Get the width of the boards.
+        """
+        return self._width
+
+    def get_grids(self):
+        """
+        Return the (num_games, grid_height, grid_width) array of tiles.
+        """
+        return self._grids
+
+    def set_grids(self, grids):
+        """
+        Replace every board with the given array of tiles.
+        """
+        numpy = self._numpy
+        self._grids = numpy.array(grids, dtype=numpy.int64).reshape(
+            (self._num_games, self._height, self._width))
+
+    def _oriented(self, grids, direction):
+        """
+        Return a view of grids whose last axis runs from the tile
+        every line merges towards to the opposite edge.
+        """
+        if direction == UP or direction == DOWN:
+            grids = grids.transpose(0, 2, 1)
+        if direction == DOWN or direction == RIGHT:
+            grids = grids[:, :, ::-1]
+        return grids
+
+    def _restored(self, lines, direction):
+        """
+        Undo _oriented(), returning a view in grid orientation.
+        """
+        if direction == DOWN or direction == RIGHT:
+            lines = lines[:, :, ::-1]
+        if direction == UP or direction == DOWN:
+            lines = lines.transpose(0, 2, 1)
+        return lines
+
+    def move(self, direction, mask=None):
+        """
+        Move all tiles of the selected boards in the given direction and
+        add a new tile to every board where any tiles moved.
+
+        direction: a direction, or an array with one direction per board
+        mask: optional boolean array of the boards to move (default all)
+
+        Returns the boolean array of boards that changed
+        """
+        numpy = self._numpy
+        if mask is None:
+            mask = numpy.ones(self._num_games, dtype=bool)
+        directions = numpy.broadcast_to(numpy.asarray(direction), (self._num_games,))
+        changed = numpy.zeros(self._num_games, dtype=bool)
+        for move_direction in OFFSETS:
+            selected = numpy.flatnonzero(mask & (directions == move_direction))
+            if len(selected) == 0:
+                continue
+            grids = self._grids[selected]
+            lines = self._oriented(grids, move_direction)
+            line_shape = lines.shape
+            merged = merge_lines(lines.reshape(-1, line_shape[2]))
+            new_grids = self._restored(merged.reshape(line_shape), move_direction)
+            changed[selected] = (new_grids != grids).any(axis=(1, 2))
+            self._grids[selected] = new_grids
+        self.new_tile(changed)
+        return changed
+
+    def new_tile(self, mask=None):
+        """
+        Create a new tile in a randomly selected empty square of
+        every selected board that has one.  The tile should be 2 90%
+        of the time and 4 10% of the time.
+        """
+        numpy = self._numpy
+        flat = self._grids.reshape(self._num_games, -1)
+        empty = flat == 0
+        if mask is not None:
+            empty &= mask[:, numpy.newaxis]
+        # the empty square with the largest random key is uniformly chosen
+        keys = numpy.where(empty, self._rng.random(flat.shape), -1.0)
+        games = numpy.flatnonzero(empty.any(axis=1))
+        squares = keys[games].argmax(axis=1)
+        values = self._square_values[self._rng.integers(0, len(SQUARE_VALUE), len(games))]
+        flat[games, squares] = values
+
+    def is_game_over(self):
+        """
+        Return the boolean array of boards with no empty square and
+        no pair of equal neighbouring tiles.
+        """
+        grids = self._grids
+        movable = (grids == 0).any(axis=(1, 2))
+        movable |= (grids[:, :, 1:] == grids[:, :, :-1]).any(axis=(1, 2))
+        movable |= (grids[:, 1:, :] == grids[:, :-1, :]).any(axis=(1, 2))
+        return ~movable
+
+def merge_lines(lines):
+    """
+    Helper function that merges every row of a 2D NumPy array
+    towards its first column, the same way merge() does for a
+    single line. Returns a new array.
+    """
+    numpy = import_numpy("merge_lines")
+    lines = _slide_lines(numpy, lines)
+    for index in range(lines.shape[1] - 1):
+        pairs = (lines[:, index] != 0) & (lines[:, index] == lines[:, index + 1])
+        lines[pairs, index] *= 2
+        lines[pairs, index + 1] = 0
+    return _slide_lines(numpy, lines)
+
+def _slide_lines(numpy, lines):
+    """
+    Slide the non-zero tiles of every row to the beginning of the row.
+    """
+    order = numpy.argsort(lines == 0, axis=1, kind="stable")
+    return numpy.take_along_axis(lines, order, axis=1)
+
+# Probability of spawning each tile value, weighted like SQUARE_VALUE
+SPAWN_PROBABILITIES = [(value, SQUARE_VALUE.count(value) / float(len(SQUARE_VALUE)))
+                       for value in sorted(set(SQUARE_VALUE))]
+# Heuristic weights used by evaluate_board()
+EMPTY_WEIGHT = 1.0
+CORNER_WEIGHT = 2.0
+MONOTONIC_WEIGHT = 0.5
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used entry
+    once it holds more than capacity entries.
+    """
+
+    def __init__(self, capacity):
+        self._capacity = capacity
+        self._entries = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Return the value stored for key, or None.
+        """
+        value = self._entries.pop(key, None)
+        if value is not None:
+            self._entries[key] = value
+        return value
+
+    def put(self, key, value):
+        """
+        Store value for key, evicting the oldest entry if needed.
+        """
+        self._entries.pop(key, None)
+        self._entries[key] = value
+        if len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove every entry.
+        """
+        self._entries.clear()
+
+def evaluate_board(mover, board):
+    """
+    Heuristic value of a packed board: rewards empty squares, the
+    largest tile sitting in a corner and rows or columns whose tiles
+    never increase towards the largest tile's edge.
+    """
+    codes = mover.unpack(board)
+    empty_num = 0
+    max_code = 0
+    for row in codes:
+        for code in row:
+            if code == 0:
+                empty_num += 1
+            elif code > max_code:
+                max_code = code
+    corners = (codes[0][0], codes[0][-1], codes[-1][0], codes[-1][-1])
+    value = EMPTY_WEIGHT * empty_num
+    if max_code in corners:
+        value += CORNER_WEIGHT * max_code
+    lines = codes + [list(col) for col in zip(*codes)]
+    for line in lines:
+        if line == sorted(line) or line == sorted(line, reverse=True):
+            value += MONOTONIC_WEIGHT
+    return value
+
+class _SearchTimeout(Exception):
+    """
+    Raised when an expectimax search runs out of its time budget.
+    """
+    pass
+
+class ExpectimaxPlayer:
+    """
+    Class to pick moves for a TwentyFortyEight game with an expectimax
+    search: max nodes try the four OFFSETS directions, chance nodes
+    average over every 2/4 spawn weighted like SQUARE_VALUE.
+    """
+
+    def __init__(self, grid_height, grid_width, max_depth=3, time_budget_ms=None,
+                 cache_size=100000, heuristic=evaluate_board):
+        """
+        max_depth: number of player moves to look ahead
+        time_budget_ms: optional time limit per move; the search deepens
+            one move at a time and keeps the result of the last complete depth
+        cache_size: maximal number of positions in the transposition table
+        heuristic: function of (mover, packed board) scoring leaf positions
+        """
+        self._height = grid_height
+        self._width = grid_width
+        self._max_depth = max_depth
+        self._time_budget_ms = time_budget_ms
+        self._heuristic = heuristic
+        self._cache_size = cache_size
+        # (mover, transposition table, spawn codes) for every code width
+        self._searches = {}
+        self._use_tile_bits(BITBOARD_TILE_BITS)
+        self._deadline = None
+
+    def _use_tile_bits(self, tile_bits):
+        """
+        Search packed boards with tile codes of the given width.
+        """
+        if tile_bits not in self._searches:
+            mover = BitboardMover(self._height, self._width, tile_bits)
+            spawn_codes = [(mover.encode(value), probability)
+                           for value, probability in SPAWN_PROBABILITIES]
+            self._searches[tile_bits] = (mover, LRUCache(self._cache_size), spawn_codes)
+        self._mover, self._cache, self._spawn_codes = self._searches[tile_bits]
+
+    def get_move(self, game):
+        """
+        Return the best direction to move the game in, or None
+        if no direction changes the board.
+        """
+        # 4-bit codes unless a tile beyond 32768 is on the board or
+        # within reach of the search
+        self._use_tile_bits(BITBOARD_TILE_BITS)
+        try:
+            return self._get_move(game)
+        except BitboardOverflowError:
+            tile_bits = bitboard_tile_bits(self._height, self._width)
+            if tile_bits <= BITBOARD_TILE_BITS:
+                raise
+            self._use_tile_bits(tile_bits)
+            return self._get_move(game)
+
+    def _get_move(self, game):
+        """
+        Return the result of get_move() with the current tile codes.
+        """
+        board = self._mover.pack(game)
+        moves = []
+        slides = self._mover.slide_all(board)
+        for direction in sorted(OFFSETS):
+            new_board = slides[direction]
+            if new_board != board:
+                moves.append((direction, new_board))
+        if len(moves) == 0:
+            return None
+        # the shallowest search always completes, so there is always a move
+        self._deadline = None
+        best_move = self._search_root(moves, 1)
+        if self._time_budget_ms is not None:
+            self._deadline = time.time() + self._time_budget_ms / 1000.0
+        for depth in range(2, self._max_depth + 1):
+            try:
+                best_move = self._search_root(moves, depth)
+            except _SearchTimeout:
+                break
+        self._deadline = None
+        return best_move
+
+    def play(self, game, max_moves=None):
+        """
+        Play the game until no direction changes the board, or for
+        at most max_moves moves. Returns the number of moves made.
+        """
+        move_num = 0
+        while max_moves is None or move_num < max_moves:
+            direction = self.get_move(game)
+            if direction is None:
+                break
+            game.move(direction)
+            move_num += 1
+        return move_num
+
+    def _search_root(self, moves, depth):
+        """
+        Return the direction with the best expected value.
+        """
+        best_move = None
+        best_value = None
+        for direction, new_board in moves:
+            value = self._chance_value(new_board, depth - 1)
+            if best_value is None or value > best_value:
+                best_move = direction
+                best_value = value
+        return best_move
+
+    def _max_value(self, board, depth):
+        """
+        Value of a position where the player moves next.
+        """
+        key = (board, depth)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        if self._deadline is not None and time.time() > self._deadline:
+            raise _SearchTimeout()
+        best_value = None
+        slides = self._mover.slide_all(board)
+        for direction in sorted(OFFSETS):
+            new_board = slides[direction]
+            if new_board != board:
+                value = self._chance_value(new_board, depth - 1)
+                if best_value is None or value > best_value:
+                    best_value = value
+        if best_value is None:
+            # game over
+            best_value = self._heuristic(self._mover, board)
+        self._cache.put(key, best_value)
+        return best_value
+
+    def _chance_value(self, board, depth):
+        """
+        Value of a position where a new tile spawns next.
+        """
+        if depth == 0:
+            return self._heuristic(self._mover, board)
+        empty_shifts = self._mover.empty_shifts(board)
+        total = 0.0
+        for shift in empty_shifts:
+            for code, probability in self._spawn_codes:
+                total += probability * self._max_value(board | (code << shift), depth)
+        return total / len(empty_shifts)
+
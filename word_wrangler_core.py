@@ -0,0 +1,201 @@
+"""
+Word Wrangler game logic, importable without CodeSkulptor: the sorted
+list functions, the string generation and the dictionary trie.
+"""
+
+
+# Functions to manipulate ordered word lists
+
+def remove_duplicates(list1):
+    """
+    Eliminate duplicates in a sorted list.
+
+    Returns a new sorted list with the same elements in list1, but
+    with no duplicates.
+
+    This function can be iterative.
+    """
+    returned_list =[]
+    item_ = ""
+    for item in list1:
+        if item!= item_:
+            item_ = item
+            returned_list.append(item_)
+    return returned_list
+
+def intersect(list1, list2):
+    """
+    Compute the intersection of two sorted lists.
+
+    Returns a new sorted list containing only elements that are in
+    both list1 and list2.
+
+    This function can be iterative.
+    """
+    returned_list = []
+    idx1 = idx2 = 0
+    while idx1 < len(list1) and idx2 < len(list2):
+        if list2[idx2] > list1[idx1]:
+            idx1 += 1
+        elif list2[idx2] < list1[idx1]:
+            idx2 += 1
+        elif list2[idx2] == list1[idx1]:
+            returned_list.append(list1[idx1])
+            idx1 += 1
+            idx2 += 1
+    return returned_list
+
+# Functions to perform merge sort
+
+def merge(list1, list2):
+    """
+    Merge two sorted lists.
+
+    Returns a new sorted list containing all of the elements that
+    are in either list1 and list2.
+
+    This function can be iterative.
+    """
+    returned_list = []
+    idx1 = idx2 = 0
+    while idx1 < len(list1) and idx2 < len(list2):
+        if list2[idx2] > list1[idx1]:
+            returned_list.append(list1[idx1])
+            idx1 += 1
+        else:
+            returned_list.append(list2[idx2])
+            idx2 += 1
+    if idx1 == len(list1):
+        for index in range(idx2, len(list2)):
+            returned_list.append(list2[index])
+    else:
+        for index in range(idx1, len(list1)):
+            returned_list.append(list1[index])
+    return returned_list
+
+def merge_sort(list1):
+    """
+    Sort the elements of list1.
+
+    Return a new sorted list with the same elements as list1.
+
+    This function should be recursive.
+    """
+    # splitting in halves keeps the recursion depth logarithmic, even
+    # for the already sorted lists the trie generates
+    if len(list1) <= 1:
+        return list(list1)
+    middle = len(list1) // 2
+    return merge(merge_sort(list1[:middle]), merge_sort(list1[middle:]))
+
+# Function to generate all strings for the word wrangler game
+
+def gen_all_strings(word):
+    """
+    Generate all strings that can be composed from the letters in word
+    in any order.
+
+    Returns a list of all strings that can be formed from the letters
+    in word.
+
+    This function should be recursive.
+    """
+    if len(word) == 0:
+        return [""]
+    first = word[0]
+    rest_strings = gen_all_strings(word[1:])
+    newstring = list(rest_strings)
+    for item in rest_strings:
+        newstring.append(first + item)
+        for index in range(len(item)-1):
+            newstring.append(item[:index+1] + first + item[index+1:])
+        if item != "":
+            newstring.append(item + first)
+    return newstring
+
+# Dictionary trie to search the words that can be formed from letters
+
+# Key marking the end of a word in a trie node
+WORD_END = ""
+
+class WordTrie:
+    """
+    Class to store a dictionary as a trie of nested dictionaries
+    mapping letters to nodes, and search it for the words that can
+    be formed from a multiset of letters.
+    """
+
+    def __init__(self, words=()):
+        self._root = {}
+        self._word_num = 0
+        for word in words:
+            self.add(word)
+
+    def __len__(self):
+        """
+        Return the number of words in the trie.
+        """
+        return self._word_num
+
+    def __contains__(self, word):
+        """
+        Return True if word is in the trie.
+        """
+        node = self._root
+        for letter in word:
+            if letter not in node:
+                return False
+            node = node[letter]
+        return WORD_END in node
+
+    def add(self, word):
+        """
+        Add a word to the trie.
+        """
+        node = self._root
+        for letter in word:
+            if letter not in node:
+                node[letter] = {}
+            node = node[letter]
+        if WORD_END not in node:
+            node[WORD_END] = True
+            self._word_num += 1
+
+    def find_words(self, letters, min_length=1):
+        """
+        Find the words of the trie that can be composed from some of
+        the letters, each used at most as many times as it appears.
+        Only the branches of the trie spelled by the letters are
+        walked, so the cost depends on the words found, not on the
+        number of orderings of the letters.
+
+        Returns a sorted list of words
+        """
+        counts = {}
+        for letter in letters:
+            counts[letter] = counts.get(letter, 0) + 1
+        found = []
+        self._find_words(self._root, "", counts, min_length, found)
+        found.sort()
+        return found
+
+    def _find_words(self, node, prefix, counts, min_length, found):
+        """
+        Add the words below node that the remaining letter counts can
+        complete to found.
+        """
+        if WORD_END in node and len(prefix) >= min_length:
+            found.append(prefix)
+        for letter in counts:
+            if counts[letter] > 0 and letter in node:
+                counts[letter] -= 1
+                self._find_words(node[letter], prefix + letter, counts, min_length, found)
+                counts[letter] += 1
+
+    def find_anagrams(self, letters):
+        """
+        Find the words of the trie that use every one of the letters.
+
+        Returns a sorted list of words
+        """
+        return self.find_words(letters, len(letters))
@@ -0,0 +1,679 @@
+"""
+Planner for Yahtzee, importable without CodeSkulptor: the scoring,
+the hold generation, the strategy and the tools built on it (strategy
+tables, turn planning, Monte Carlo estimates and batch evaluation).
+Simplifications:  only allow discard and roll, only score against upper level
+"""
+
+import collections
+import math
+import struct
+
+# NumPy is loaded on first use: only the Monte Carlo estimator needs it
+from optional_numpy import import_numpy
+
+def gen_all_sequences(outcomes, length):
+    """
+    Iterative function that enumerates the set of all sequences of
+    outcomes of given length.
+    """
+
+    answer_set = set([()])
+    for dummy_idx in range(length):
+        temp_set = set()
+        for partial_sequence in answer_set:
+            for item in outcomes:
+                new_sequence = list(partial_sequence)
+                new_sequence.append(item)
+                temp_set.add(tuple(new_sequence))
+        answer_set = temp_set
+    return answer_set
+
+
+def score(hand):
+    """
+    Compute the maximal score for a Yahtzee hand according to the
+    upper section of the Yahtzee score card.
+
+    hand: sorted tuple representing a full Yahtzee hand
+
+    Returns an integer score
+    """
+    max_score = 0
+    score_result = 0
+    hand_item = 0
+    for hand_idx in range(len(hand)):
+        if hand_item != hand[hand_idx]:
+            hand_item = hand[hand_idx]
+            score_result = hand_item
+        else:
+            score_result += hand[hand_idx]
+        if score_result > max_score:
+            max_score = score_result
+    return max_score
+
+def gen_sorted_sequences(outcomes, length):
+    """
+    Iterative function that enumerates the set of all sorted
+    sequences of outcomes of given length, i.e. one sequence per
+    multiset of outcomes.
+    """
+
+    outcomes = sorted(set(outcomes))
+    answer_set = set([()])
+    for dummy_idx in range(length):
+        temp_set = set()
+        for partial_sequence in answer_set:
+            for item in outcomes:
+                if len(partial_sequence) == 0 or item >= partial_sequence[-1]:
+                    temp_set.add(partial_sequence + (item,))
+        answer_set = temp_set
+    return answer_set
+
+def count_orderings(sequence):
+    """
+    Compute the number of distinct orderings of a sequence, that is
+    the multinomial coefficient of the counts of its items.
+
+    Returns an integer
+    """
+    orderings = 1
+    counts = {}
+    for idx in range(len(sequence)):
+        item = sequence[idx]
+        counts[item] = counts.get(item, 0) + 1
+        # len!/prod(count!) built up one item at a time
+        orderings = orderings * (idx + 1) // counts[item]
+    return orderings
+
+# Memoized results of expected_value, keyed by its arguments
+_EXPECTED_VALUES = {}
+
+def expected_value(held_dice, num_die_sides, num_free_dice):
+    """
+    Compute the expected value of the held_dice given that there
+    are num_free_dice to be rolled, each with num_die_sides.
+
+    held_dice: a sorted tuple representing dice that you will hold
+    num_die_sides: number of sides on each die
+    num_free_dice: number of dice to be rolled
+
+    Returns a floating point expected value
+    """
+    key = (tuple(held_dice), num_die_sides, num_free_dice)
+    if key in _EXPECTED_VALUES:
+        return _EXPECTED_VALUES[key]
+    score_total = 0
+    # every sorted free roll stands for all of its orderings
+    for free_roll in gen_sorted_sequences(range(1, num_die_sides + 1), num_free_dice):
+        dice_order = list(key[0] + free_roll)
+        dice_order.sort()
+        score_total += count_orderings(free_roll) * score(tuple(dice_order))
+    value = float(score_total) / float(num_die_sides ** num_free_dice)
+    _EXPECTED_VALUES[key] = value
+    return value
+
+def _binomial_rows(num_rows):
+    """
+    Return Pascal's triangle as a list of rows, row n holding C(n, k).
+    """
+    rows = [[1]]
+    for dummy_idx in range(num_rows - 1):
+        last = rows[-1]
+        rows.append([1] + [last[idx] + last[idx + 1] for idx in range(len(last) - 1)] + [1])
+    return rows
+
+def _count_rolls_below(held_counts, num_die_sides, num_free_dice, threshold, binomials):
+    """
+    Count the ordered rolls of num_free_dice dice after which every
+    value times its number of dice in the hand is below threshold,
+    i.e. the rolls scoring less than threshold.
+
+    This is num_free_dice! times the coefficient of x^num_free_dice in
+    the product over the values of sum(x^k / k!) for the k extra dice
+    the value may show, computed with integer convolutions.
+    """
+    # ways[num] counts rolls of num dice over the values seen so far
+    ways = [1] + [0] * num_free_dice
+    unlimited = 0
+    for value in range(1, num_die_sides + 1):
+        limit = (threshold - 1) // value - held_counts.get(value, 0)
+        if limit < 0:
+            return 0
+        if limit >= num_free_dice:
+            unlimited += 1
+            continue
+        new_ways = [0] * (num_free_dice + 1)
+        for num in range(num_free_dice + 1):
+            row = binomials[num]
+            total = 0
+            for num_value in range(min(limit, num) + 1):
+                total += row[num_value] * ways[num - num_value]
+            new_ways[num] = total
+        ways = new_ways
+    # the remaining dice show any of the unlimited values
+    row = binomials[num_free_dice]
+    return sum(row[num] * ways[num] * unlimited ** (num_free_dice - num)
+               for num in range(num_free_dice + 1))
+
+# Memoized results of expected_value_polynomial, keyed by its arguments
+_POLYNOMIAL_VALUES = {}
+
+def expected_value_polynomial(held_dice, num_die_sides, num_free_dice):
+    """
+    Compute the same expected value as expected_value without
+    enumerating the rolls, in time polynomial in the number of dice
+    and sides: the score is at least t unless every value times its
+    count is below t, and those rolls are counted per threshold t
+    with _count_rolls_below.
+
+    Returns a floating point expected value
+    """
+    key = (tuple(held_dice), num_die_sides, num_free_dice)
+    if key in _POLYNOMIAL_VALUES:
+        return _POLYNOMIAL_VALUES[key]
+    held_counts = {}
+    for item in key[0]:
+        held_counts[item] = held_counts.get(item, 0) + 1
+    num_dice = len(key[0]) + num_free_dice
+    values = set(held_counts)
+    if num_free_dice > 0:
+        values.update(range(1, num_die_sides + 1))
+    thresholds = sorted(set(value * count for value in values
+                            for count in range(1, num_dice + 1)))
+    binomials = _binomial_rows(num_free_dice + 1)
+    num_rolls = num_die_sides ** num_free_dice
+    # the sum of the scores of all rolls is the sum over thresholds t of
+    # (t - previous t) times the number of rolls scoring at least t
+    score_total = 0
+    last_threshold = 0
+    for threshold in thresholds:
+        num_above = num_rolls - _count_rolls_below(held_counts, num_die_sides, num_free_dice,
+                                                   threshold, binomials)
+        if num_above == 0:
+            break
+        score_total += (threshold - last_threshold) * num_above
+        last_threshold = threshold
+    value = float(score_total) / float(num_rolls)
+    _POLYNOMIAL_VALUES[key] = value
+    return value
+
+def verify_if_sublist(list_, sub_list):
+    """
+    Verify whether a list is a sublist of another list
+
+    list_ : the main list
+
+    sub_list: the list needed to be verified
+
+    Returns True if is a sublist
+    """
+    for item in sub_list:
+        if sub_list.count(item) > list_.count(item):
+            return False
+    return True
+
+def gen_all_holds(hand):
+    """
+    Generate all possible choices of dice from hand to hold.
+
+    hand: sorted tuple representing a full Yahtzee hand
+
+    Returns a set of sorted tuples, where each tuple is dice to hold
+    """
+    counts = {}
+    for item in hand:
+        counts[item] = counts.get(item, 0) + 1
+    # a hold keeps between 0 and count dice of every value, so every
+    # combination of per-value choices is a distinct hold
+    answer_list = [()]
+    for item in sorted(counts):
+        temp_list = []
+        for partial_sequence in answer_list:
+            for num_held in range(counts[item] + 1):
+                temp_list.append(partial_sequence + (item,) * num_held)
+        answer_list = temp_list
+    return set(answer_list)
+
+def strategy(hand, num_die_sides, evaluator=expected_value):
+    """
+    Compute the hold that maximizes the expected value when the
+    discarded dice are rolled.
+
+    hand: sorted tuple representing a full Yahtzee hand
+    num_die_sides: number of sides on each die
+    evaluator: function computing the expected value of a hold, with
+        the arguments of expected_value; expected_value_polynomial
+        scales to many dice and sides
+
+    Returns a tuple where the first element is the expected score and
+    the second element is a tuple of the dice to hold
+    """
+    possible_holds = gen_all_holds(hand)
+    hand_len = len(hand)
+    dict_result = {}
+    max_value = 0
+    for possible_hold in possible_holds:
+        hold_len = len(possible_hold)
+        expectvalue = evaluator(possible_hold, num_die_sides, hand_len-hold_len)
+        if expectvalue > max_value:
+            max_value = expectvalue
+        dict_result[expectvalue] = possible_hold
+    return (max_value, dict_result[max_value])
+
+# Strategy tables: the best hold of every sorted hand of a configuration,
+# stored by rank of the hand. The header is followed by one record per
+# hand: the expected score and a bitmask of the held positions.
+TABLE_MAGIC = b"YTZ1"
+TABLE_HEADER = struct.Struct("<4sBBI")
+TABLE_RECORD = struct.Struct("<dI")
+MAX_TABLE_DICE = 32
+
+def count_sorted_hands(num_dice, num_values):
+    """
+    Compute the number of sorted hands of num_dice dice showing
+    num_values different values, i.e. C(num_values + num_dice - 1, num_dice).
+
+    Returns an integer
+    """
+    count = 1
+    for idx in range(num_dice):
+        count = count * (num_values + idx) // (idx + 1)
+    return count
+
+def hand_index(hand, num_die_sides):
+    """
+    Compute the rank of a sorted hand among all sorted hands of the
+    same length in lexicographic order, e.g. (1, 1, 1, 1, 1) is 0.
+
+    Returns an integer
+    """
+    rank = 0
+    low = 1
+    hand_len = len(hand)
+    for idx in range(hand_len):
+        # skip every hand whose die at idx is smaller than hand[idx]
+        for value in range(low, hand[idx]):
+            rank += count_sorted_hands(hand_len - idx - 1, num_die_sides - value + 1)
+        low = hand[idx]
+    return rank
+
+def gen_all_hands(num_dice, num_die_sides):
+    """
+    Returns a list of all sorted hands of num_dice dice, in order of
+    hand_index
+    """
+    return sorted(gen_sorted_sequences(range(1, num_die_sides + 1), num_dice))
+
+def _hold_mask(hand, hold):
+    """
+    Return the bitmask of the positions of hand holding the dice of hold.
+    """
+    mask = 0
+    start = 0
+    for item in hold:
+        idx = hand.index(item, start)
+        mask |= 1 << idx
+        start = idx + 1
+    return mask
+
+def _mask_hold(hand, mask):
+    """
+    Return the dice of hand at the positions set in mask.
+    """
+    return tuple(hand[idx] for idx in range(len(hand)) if mask >> idx & 1)
+
+def build_strategy_table(path, num_dice=5, num_die_sides=6):
+    """
+    Compute strategy() for every sorted hand of num_dice dice with
+    num_die_sides sides and save the results to a table file.
+
+    Returns the number of hands in the table
+    """
+    if not 0 < num_dice <= MAX_TABLE_DICE or not 0 < num_die_sides < 256:
+        raise ValueError("unsupported table configuration")
+    hands = gen_all_hands(num_dice, num_die_sides)
+    data = bytearray(TABLE_HEADER.pack(TABLE_MAGIC, num_dice, num_die_sides, len(hands)))
+    for hand in hands:
+        value, hold = strategy(hand, num_die_sides)
+        data += TABLE_RECORD.pack(value, _hold_mask(hand, tuple(sorted(hold))))
+    with open(path, "wb") as table_file:
+        table_file.write(data)
+    return len(hands)
+
+class StrategyTable:
+    """
+    Class to look up the best hold of a hand in a table file written
+    by build_strategy_table. The file is read on the first lookup.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._data = None
+        self._num_dice = None
+        self._num_die_sides = None
+
+    def _load(self):
+        """
+        Read and check the table file.
+        """
+        with open(self._path, "rb") as table_file:
+            data = table_file.read()
+        if len(data) < TABLE_HEADER.size:
+            raise ValueError("truncated strategy table")
+        magic, num_dice, num_die_sides, hand_num = TABLE_HEADER.unpack_from(data, 0)
+        if magic != TABLE_MAGIC:
+            raise ValueError("not a Yahtzee strategy table")
+        if (hand_num != count_sorted_hands(num_dice, num_die_sides) or
+                len(data) != TABLE_HEADER.size + hand_num * TABLE_RECORD.size):
+            raise ValueError("truncated strategy table")
+        self._num_dice = num_dice
+        self._num_die_sides = num_die_sides
+        self._data = data
+
+    def get_num_dice(self):
+        """
+        Return the number of dice of the hands in the table.
+        """
+        if self._data is None:
+            self._load()
+        return self._num_dice
+
+    def get_num_die_sides(self):
+        """
+        Return the number of sides of the dice of the table.
+        """
+        if self._data is None:
+            self._load()
+        return self._num_die_sides
+
+    def strategy(self, hand):
+        """
+        Look up the best hold of a sorted hand.
+
+        Returns a tuple where the first element is the expected score and
+        the second element is a tuple of the dice to hold, as strategy()
+        """
+        if self._data is None:
+            self._load()
+        if len(hand) != self._num_dice:
+            raise ValueError("hand does not match the table")
+        if list(hand) != sorted(hand) or hand[0] < 1 or hand[-1] > self._num_die_sides:
+            raise ValueError("hand is not a sorted hand of dice from 1 to " +
+                             str(self._num_die_sides))
+        offset = TABLE_HEADER.size + hand_index(hand, self._num_die_sides) * TABLE_RECORD.size
+        value, mask = TABLE_RECORD.unpack_from(self._data, offset)
+        return (value, _mask_hold(hand, mask))
+
+class TurnPlanner:
+    """
+    Class to plan the holds of a whole turn: the hand is rolled, then
+    up to num_rolls - 1 times some dice are held and the others rolled
+    again, and the final hand is scored with score_function.
+
+    Hands and holds are identified by their hand_index (holds of k
+    dice after the holds of fewer dice), and the transitions from
+    every hold to the hands it can roll into are computed once and
+    shared by every roll. The best value of every (rolls left, hand)
+    state is computed once, when first needed.
+    """
+
+    def __init__(self, num_dice=5, num_die_sides=6, num_rolls=3, score_function=score):
+        self._num_dice = num_dice
+        self._num_die_sides = num_die_sides
+        self._num_rolls = num_rolls
+        self._hands = gen_all_hands(num_dice, num_die_sides)
+        # first hold id of the holds of every length
+        self._hold_offsets = [0]
+        for length in range(num_dice + 1):
+            self._hold_offsets.append(self._hold_offsets[-1] +
+                                      count_sorted_hands(length, num_die_sides))
+        self._hold_dice = [None] * self._hold_offsets[-1]
+        # (hand index, number of orderings) of every roll after a hold
+        self._transitions = [None] * self._hold_offsets[-1]
+        self._num_rolls_after = [0] * self._hold_offsets[-1]
+        for length in range(num_dice + 1):
+            free_rolls = [(roll, count_orderings(roll)) for roll in
+                          gen_sorted_sequences(range(1, num_die_sides + 1), num_dice - length)]
+            for hold in gen_all_hands(length, num_die_sides):
+                hold_id = self._hold_id(hold)
+                self._hold_dice[hold_id] = hold
+                self._transitions[hold_id] = [
+                    (hand_index(tuple(sorted(hold + roll)), num_die_sides), weight)
+                    for roll, weight in free_rolls]
+                self._num_rolls_after[hold_id] = num_die_sides ** (num_dice - length)
+        self._hand_holds = [[self._hold_id(hold) for hold in sorted(gen_all_holds(hand))]
+                            for hand in self._hands]
+        # best values by rolls left, then the best hold ids
+        self._values = [[float(score_function(hand)) for hand in self._hands]]
+        self._best_holds = [None]
+
+    def _hold_id(self, hold):
+        """
+        Return the id of a sorted hold.
+        """
+        return self._hold_offsets[len(hold)] + hand_index(hold, self._num_die_sides)
+
+    def _hold_values(self, rolls_left):
+        """
+        Return the expected value of every hold when rolls_left
+        rolls remain after it is rolled.
+        """
+        next_values = self._values[rolls_left]
+        return [sum(weight * next_values[index] for index, weight in transitions) /
+                float(num_rolls)
+                for transitions, num_rolls in zip(self._transitions, self._num_rolls_after)]
+
+    def _solve(self, rolls_left):
+        """
+        Compute the best values and holds up to rolls_left rolls left.
+        """
+        while len(self._values) <= rolls_left:
+            hold_values = self._hold_values(len(self._values) - 1)
+            values = []
+            best_holds = []
+            for hold_ids in self._hand_holds:
+                best_id = max(hold_ids, key=lambda hold_id: hold_values[hold_id])
+                values.append(hold_values[best_id])
+                best_holds.append(best_id)
+            self._values.append(values)
+            self._best_holds.append(best_holds)
+
+    def get_value(self, hand, rolls_left):
+        """
+        Return the expected final score of a sorted hand when the
+        best holds are played with rolls_left rolls remaining.
+        """
+        self._solve(rolls_left)
+        return self._values[rolls_left][hand_index(hand, self._num_die_sides)]
+
+    def strategy(self, hand, rolls_left=1):
+        """
+        Compute the best hold of a sorted hand with rolls_left rolls
+        remaining, as strategy() does for a single roll.
+
+        Returns a tuple where the first element is the expected score and
+        the second element is a tuple of the dice to hold
+        """
+        if rolls_left < 1:
+            raise ValueError("no roll left to hold dice for")
+        self._solve(rolls_left)
+        index = hand_index(hand, self._num_die_sides)
+        hold_id = self._best_holds[rolls_left][index]
+        return (self._values[rolls_left][index], self._hold_dice[hold_id])
+
+    def get_turn_value(self):
+        """
+        Return the expected final score of a turn played with the
+        best holds, before the first roll.
+        """
+        self._solve(self._num_rolls - 1)
+        return self._hold_values(self._num_rolls - 1)[self._hold_id(())]
+
+# Monte Carlo estimates of the value of holds, for configurations too
+# large to enumerate
+HoldEstimate = collections.namedtuple("HoldEstimate", ["mean", "low", "high", "samples"])
+MC_BATCH_SIZE = 4096
+MC_MAX_SAMPLES = 200000
+# Half width of the confidence intervals, in standard errors
+MC_Z_SCORE = 3.0
+
+def _sample_scores(numpy, rng, hold, num_die_sides, num_free_dice, num_samples):
+    """
+    Roll num_free_dice dice num_samples times next to hold.
+
+    Returns the array of the scores of the hands
+    """
+    faces = numpy.arange(1, num_die_sides + 1)
+    counts = numpy.zeros((num_samples, num_die_sides), dtype=numpy.int64)
+    for item in hold:
+        counts[:, item - 1] += 1
+    rolls = rng.integers(1, num_die_sides + 1, size=(num_samples, num_free_dice))
+    for die in range(num_free_dice):
+        counts += rolls[:, die:die + 1] == faces
+    return (counts * faces).max(axis=1)
+
+def estimate_holds(hand, num_die_sides, batch_size=MC_BATCH_SIZE,
+                   max_samples=MC_MAX_SAMPLES, z_score=MC_Z_SCORE, seed=None):
+    """
+    Estimate the expected value of every hold of a hand by rolling
+    batches of dice. After each round of batches, holds whose upper
+    confidence bound is below the best lower bound stop sampling.
+    Holds that roll no die are scored exactly.
+
+    Returns a dictionary mapping each hold to a HoldEstimate
+    """
+    numpy = import_numpy("Monte Carlo estimates")
+    rng = numpy.random.default_rng(seed)
+    estimates = {}
+    # sum, sum of squares and number of the sampled scores
+    sums = {}
+    for hold in gen_all_holds(hand):
+        if len(hold) == len(hand):
+            value = float(score(hold))
+            estimates[hold] = HoldEstimate(value, value, value, 0)
+        else:
+            sums[hold] = [0.0, 0.0, 0]
+    active = sorted(sums)
+    while len(active) > 0:
+        for hold in active:
+            num_samples = min(batch_size, max_samples - sums[hold][2])
+            scores = _sample_scores(numpy, rng, hold, num_die_sides,
+                                    len(hand) - len(hold), num_samples)
+            sums[hold][0] += float(scores.sum())
+            sums[hold][1] += float((scores.astype(float) ** 2).sum())
+            sums[hold][2] += num_samples
+            total, squares, count = sums[hold]
+            mean = total / count
+            variance = max(squares / count - mean * mean, 0.0) * count / max(count - 1, 1)
+            half_width = z_score * math.sqrt(variance / count)
+            estimates[hold] = HoldEstimate(mean, mean - half_width, mean + half_width, count)
+        best_low = max(estimate.low for estimate in estimates.values())
+        active = [hold for hold in active if estimates[hold].high >= best_low and
+                  sums[hold][2] < max_samples]
+        if len(active) == 1 and estimates[active[0]].low >= max(
+                estimate.high for hold, estimate in estimates.items() if hold != active[0]):
+            break
+    return estimates
+
+def strategy_monte_carlo(hand, num_die_sides, batch_size=MC_BATCH_SIZE,
+                         max_samples=MC_MAX_SAMPLES, z_score=MC_Z_SCORE, seed=None):
+    """
+    Compute the hold that maximizes the estimated expected value when
+    the discarded dice are rolled, see estimate_holds.
+
+    Returns a tuple where the first element is the estimated expected
+    score and the second element is a tuple of the dice to hold, as
+    strategy()
+    """
+    estimates = estimate_holds(hand, num_die_sides, batch_size, max_samples, z_score, seed)
+    best_hold = max(sorted(estimates), key=lambda hold: estimates[hold].mean)
+    return (estimates[best_hold].mean, best_hold)
+
+# Number of hands read from the input of iter_batch_strategy at a time
+BATCH_BLOCK_SIZE = 10000
+# StrategyTable shared by the hands a batch worker process evaluates
+_BATCH_TABLE = None
+
+def _init_batch_worker(table_path):
+    """
+    Open the strategy table of a batch worker process, if any.
+    """
+    global _BATCH_TABLE
+    _BATCH_TABLE = None if table_path is None else StrategyTable(table_path)
+
+def _batch_strategy_task(task):
+    """
+    Compute the strategy of a sorted hand in a batch worker process,
+    from the table when it covers the hand. Workers keep their
+    expected_value memo between tasks.
+    """
+    hand, num_die_sides = task
+    if (_BATCH_TABLE is not None and _BATCH_TABLE.get_num_die_sides() == num_die_sides and
+            _BATCH_TABLE.get_num_dice() == len(hand)):
+        return _BATCH_TABLE.strategy(hand)
+    value, hold = strategy(hand, num_die_sides)
+    return (value, tuple(sorted(hold)))
+
+def _take(iterator, num):
+    """
+    Return a list of the next num items of an iterator.
+    """
+    items = []
+    for item in iterator:
+        items.append(item)
+        if len(items) == num:
+            break
+    return items
+
+def _iter_batch_blocks(hands, num_die_sides, pool, chunksize, block_size):
+    """
+    Evaluate a stream of hands block by block, over a pool or in the
+    calling process when pool is None.
+    """
+    results = {}
+    hands = iter(hands)
+    while True:
+        block = [(hand, tuple(sorted(hand))) for hand in _take(hands, block_size)]
+        if len(block) == 0:
+            break
+        new_keys = []
+        for dummy_hand, key in block:
+            if key not in results:
+                results[key] = None
+                new_keys.append(key)
+        tasks = [(key, num_die_sides) for key in new_keys]
+        if pool is None:
+            answers = (_batch_strategy_task(task) for task in tasks)
+        else:
+            answers = pool.imap(_batch_strategy_task, tasks, chunksize)
+        new_keys = iter(new_keys)
+        for hand, key in block:
+            # answers arrive in the order of first appearance
+            while results[key] is None:
+                results[next(new_keys)] = next(answers)
+            yield (hand, results[key])
+
+def iter_batch_strategy(hands, num_die_sides, processes=None, table_path=None,
+                        chunksize=16, block_size=BATCH_BLOCK_SIZE):
+    """
+    Compute strategy() for a stream of hands over a process pool.
+    Hands are sorted, and every distinct sorted hand is evaluated
+    only once for the whole stream.
+
+    processes: number of worker processes (default: one per CPU);
+        0 evaluates every hand in the calling process
+    table_path: optional strategy table file the workers look hands up in
+
+    Yields a tuple (hand, (expected score, hold)) for every hand, in
+    input order, as soon as its result is known
+    """
+    if processes == 0:
+        _init_batch_worker(table_path)
+        for result in _iter_batch_blocks(hands, num_die_sides, None, chunksize, block_size):
+            yield result
+        return
+    from process_pool import worker_pool
+    with worker_pool(processes, _init_batch_worker, (table_path,)) as pool:
+        for result in _iter_batch_blocks(hands, num_die_sides, pool, chunksize, block_size):
+            yield result